@@ -4,8 +4,9 @@ This module contains the Server class to
 paginate a dataset of popular baby names.
 """
 
-import csv
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+from dataset_backends import load_dataset
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -25,18 +26,18 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
         """Initializes a new Server instance.
+        `backend` names one of `dataset_backends.BACKENDS`; "mmap"
+        decodes only the rows of the requested page.
         """
+        self.backend = backend
         self.__dataset = None
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List]:
         """Cached dataset."""
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            self.__dataset = load_dataset(self.DATA_FILE, self.backend)
 
         return self.__dataset
 
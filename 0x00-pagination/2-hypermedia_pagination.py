@@ -4,10 +4,12 @@ A module that defines a Server class for paginating data
 from a dataset.
 """
 
-from typing import List, Dict, Any, Tuple
-import csv
+from typing import List, Dict, Any, Sequence, Tuple
 import math
 
+from dataset_backends import load_dataset
+from secondary_index import FilteredView, SecondaryIndex
+
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
     """Retrieves the index range from a given page and page size.
@@ -28,32 +30,114 @@ class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    PAGE_COUNT_CACHE_SIZE = 1024
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
         """Initializes a new Server instance.
+
+        Args:
+            backend (str): The dataset storage backend, see
+                `dataset_backends.BACKENDS`.
         """
+        self.backend = backend
         self.__dataset = None
+        self.__index = None
+        self.__row_count = None
+        self.__total_pages = {}
 
-    def dataset(self) -> List[List[str]]:
+    def dataset(self) -> Sequence[List[str]]:
         """Cached dataset
 
         Returns:
-            List[List[str]]: The dataset.
+            Sequence[List[str]]: The dataset, stored column by column.
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Skip header
+            self.__dataset = load_dataset(self.DATA_FILE, self.backend)
 
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List[str]]:
+    def index(self) -> SecondaryIndex:
+        """Cached secondary index over the dataset columns.
+
+        Returns:
+            SecondaryIndex: The index.
+        """
+        if self.__index is None:
+            dataset = self.dataset()
+            self.__index = SecondaryIndex(dataset, dataset.header)
+        return self.__index
+
+    def reload(self) -> None:
+        """Picks up changes to the data file and drops the cached
+        row count, page counts and indexes.
+        """
+        refresh = getattr(self.__dataset, "refresh", None)
+        if refresh is None:
+            self.__dataset = None
+        else:
+            refresh()
+        self.__index = None
+        self.__row_count = None
+        self.__total_pages.clear()
+
+    def rows(self, filters: Dict[str, Any] = None) -> Sequence[List[str]]:
+        """The dataset rows matching some filters.
+
+        Args:
+            filters (Dict[str, Any]): Column names mapped to a value, or
+                to a list of accepted values, e.g. {"Gender": "FEMALE",
+                "Year of Birth": 2016}. All filters must match.
+
+        Returns:
+            Sequence[List[str]]: The matching rows, in dataset order.
+        """
+        if not filters:
+            return self.dataset()
+        return FilteredView(self.dataset(), self.index().select(filters))
+
+    def row_count(self, filters: Dict[str, Any] = None) -> int:
+        """Cached number of rows in the dataset.
+
+        Args:
+            filters (Dict[str, Any]): Only count the matching rows.
+
+        Returns:
+            int: The number of rows.
+        """
+        if filters:
+            return len(self.index().select(filters))
+        if self.__row_count is None:
+            self.__row_count = len(self.dataset())
+        return self.__row_count
+
+    def total_pages(self, page_size: int,
+                    filters: Dict[str, Any] = None) -> int:
+        """Cached number of pages for a given page size.
+
+        Args:
+            page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only count the matching rows.
+
+        Returns:
+            int: The number of pages.
+        """
+        key = (page_size, self.index().key(filters) if filters else None)
+        total = self.__total_pages.get(key)
+        if total is None:
+            total = math.ceil(self.row_count(filters) / page_size)
+            if len(self.__total_pages) >= self.PAGE_COUNT_CACHE_SIZE:
+                self.__total_pages.clear()
+            self.__total_pages[key] = total
+        return total
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Dict[str, Any] = None) -> List[List[str]]:
         """Retrieves a page of data.
 
         Args:
             page (int): The page number.
             page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only page through the matching rows.
 
         Returns:
             List[List[str]]: The requested page of the dataset.
@@ -61,32 +145,103 @@ class Server:
         assert isinstance(page, int) and isinstance(page_size, int)
         assert page > 0 and page_size > 0
         start, end = index_range(page, page_size)
-        data = self.dataset()
+        data = self.rows(filters)
         if start >= len(data):
             return []
         return data[start:end]
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+    def get_pages(self, pages: List[Tuple[int, int]],
+                  filters: Dict[str, Any] = None) -> List[List[List[str]]]:
+        """Retrieves many pages of data in one call.
+
+        Args:
+            pages (List[Tuple[int, int]]): (page, page_size) pairs.
+            filters (Dict[str, Any]): Only page through the matching rows.
+
+        Returns:
+            List[List[List[str]]]: The requested pages, in order.
+        """
+        data = self.rows(filters)
+        ranges = []
+        for page, page_size in pages:
+            assert isinstance(page, int) and isinstance(page_size, int)
+            assert page > 0 and page_size > 0
+            start, end = index_range(page, page_size)
+            ranges.append((min(start, len(data)), min(end, len(data))))
+        take_ranges = getattr(data, "take_ranges", None)
+        if take_ranges is not None:
+            return take_ranges(ranges)
+        return [data[start:end] for start, end in ranges]
+
+    def __hyper(self, page: int, page_size: int, filters: Dict[str, Any],
+                data: Any = None) -> Dict[str, Any]:
+        """Builds a hypermedia pagination dictionary from the cached
+        metadata. `data` is left out when it is None.
+        """
+        assert isinstance(page, int) and isinstance(page_size, int)
+        assert page > 0 and page_size > 0
+        start, end = index_range(page, page_size)
+        count = self.row_count(filters)
+        page_info = {
+            'page_size': max(0, min(end, count) - start),
+            'page': page,
+            'data': data,
+            'next_page': page + 1 if end < count else None,
+            'prev_page': page - 1 if start > 0 else None,
+            'total_pages': self.total_pages(page_size, filters),
+        }
+        if data is None:
+            del page_info['data']
+        return page_info
+
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Get a hypermedia pagination dictionary.
 
         Args:
             page (int): The page number.
             page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only page through the matching rows.
+
+        Returns:
+            Dict[str, Any]: A dictionary with pagination details.
+        """
+        data = self.get_page(page, page_size, filters)
+        return self.__hyper(page, page_size, filters, data)
+
+    def get_hyper_meta(self, page: int = 1, page_size: int = 10,
+                       filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Get the hypermedia pagination details without the page data,
+        e.g. for HEAD requests or link headers.
+
+        Args:
+            page (int): The page number.
+            page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only page through the matching rows.
+
+        Returns:
+            Dict[str, Any]: A dictionary with pagination details.
+        """
+        return self.__hyper(page, page_size, filters)
+
+    def get_hyper_iter(self, page: int = 1, page_size: int = 10,
+                       filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Get a hypermedia pagination dictionary whose data is a generator
+        yielding the page rows on demand.
+
+        Args:
+            page (int): The page number.
+            page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only page through the matching rows.
 
         Returns:
             Dict[str, Any]: A dictionary with pagination details.
         """
-        page_data = self.get_page(page, page_size)
+        meta = self.__hyper(page, page_size, filters)
         start, _ = index_range(page, page_size)
-        total_pages = math.ceil(len(self.dataset()) / page_size)
-        page_info = {
-            'page_size': len(page_data),
-            'page': page,
-            'data': page_data,
-            'next_page': page + 1 if start + len(page_data)
-            < len(self.dataset()) else None,
-            'prev_page': page - 1 if start > 0 else None,
-            'total_pages': total_pages,
-        }
-        return page_info
+        data = self.rows(filters)
+        rows = (data[i] for i in range(start, start + meta['page_size']))
+        return self.__hyper(page, page_size, filters, rows)
@@ -3,9 +3,17 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
 import math
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Sequence, Tuple
+
+from cursor_pagination import (
+    SortedView, decode_cursor, encode_cursor, parse_order
+)
+from dataset_backends import load_dataset
+from live_index import IndexedDataset, LiveSet
+
+# Fields of the state of a cursor, see `Server.get_cursor_page`
+CURSOR_FIELDS = {'o': list, 'k': list, 'i': int, 'p': int, 'e': int}
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -26,35 +34,39 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, backend: str = "columnar"):
+        """Initializes a new Server instance.
+
+        Args:
+            backend (str): The dataset storage backend, see
+                `dataset_backends.BACKENDS`.
+        """
+        self.backend = backend
         self.__dataset = None
         self.__indexed_dataset = None
+        self.__sorted_views = {}
+        self.__live_orders = {}
 
-    def dataset(self) -> List[List[str]]:
+    def dataset(self) -> Sequence[List[str]]:
         """Cached dataset.
 
         Returns:
-            List[List[str]]: The dataset.
+            Sequence[List[str]]: The dataset, stored column by column.
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            self.__dataset = load_dataset(self.DATA_FILE, self.backend)
 
         return self.__dataset
 
-    def indexed_dataset(self) -> Dict[int, List[str]]:
+    def indexed_dataset(self) -> IndexedDataset:
         """Dataset indexed by sorting position, starting at 0.
 
         Returns:
-            Dict[int, List[str]]: The indexed dataset.
+            IndexedDataset: The indexed dataset, a mapping from every
+            live position to its row.
         """
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            self.__indexed_dataset = IndexedDataset(self.dataset())
         return self.__indexed_dataset
 
     def get_page(self, page: int = 1, page_size: int = 10) -> List[List[str]]:
@@ -75,7 +87,8 @@ class Server:
             return []
         return data[start:end]
 
-    def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict[str, Any]:
+    def get_hyper_index(self, index: int = None,
+                        page_size: int = 10) -> Dict[str, Any]:
         """Retrieves a page of data with deletion-resilience.
 
         Args:
@@ -84,24 +97,111 @@ class Server:
 
         Returns:
             Dict[str, Any]: A dictionary containing pagination information.
+            `next_index` is None once the end of the dataset is reached.
         """
-        assert index is not None and index >= 0
+        assert isinstance(index, int) and isinstance(page_size, int)
+        assert 0 <= index < len(self.dataset()) and page_size > 0
         indexed_data = self.indexed_dataset()
-        
-        page_data = []
-        next_index = index
-        data_count = 0
-        
-        while data_count < page_size:
-            if next_index in indexed_data:
-                page_data.append(indexed_data[next_index])
-                data_count += 1
-            next_index += 1
-        
+        keys, has_more = indexed_data.next_live(index, page_size)
+        page_data = [indexed_data[key] for key in keys]
         return {
             'index': index,
-            'next_index': next_index,
+            'next_index': keys[-1] + 1 if has_more else None,
             'page_size': len(page_data),
             'data': page_data,
         }
-        
\ No newline at end of file
+
+    def sorted_view(self, order: Tuple[Tuple[int, bool], ...]) -> SortedView:
+        """Cached sort permutation of the dataset for a given order.
+
+        Args:
+            order (Tuple[Tuple[int, bool], ...]): (column, descending)
+                pairs, as returned by `cursor_pagination.parse_order`.
+
+        Returns:
+            SortedView: The sorted positions.
+        """
+        view = self.__sorted_views.get(order)
+        if view is None:
+            view = self.__sorted_views[order] = SortedView(
+                self.dataset(), order)
+        return view
+
+    def live_order(self, order: Tuple[Tuple[int, bool], ...]) -> LiveSet:
+        """Live rows of the dataset in a given order.
+
+        Args:
+            order (Tuple[Tuple[int, bool], ...]): (column, descending)
+                pairs, as returned by `cursor_pagination.parse_order`.
+
+        Returns:
+            LiveSet: The indexes in `sorted_view(order).perm` of the live
+            rows, kept up to date by deletions.
+        """
+        live = self.__live_orders.get(order)
+        if live is None:
+            live = self.__live_orders[order] = self.indexed_dataset().track(
+                self.sorted_view(order).perm)
+        return live
+
+    def get_cursor_page(self, cursor: str = None, page_size: int = 10,
+                        order_by: Sequence[str] = ()) -> Dict[str, Any]:
+        """Retrieves a page of data with keyset (cursor) pagination.
+
+        Args:
+            cursor (str): The `next_cursor` of the previous page, or None
+                for the first page.
+            page_size (int): The number of items to return.
+            order_by (Sequence[str]): Column names, each optionally
+                followed by "asc" or "desc". Ignored when a cursor is
+                given, since the cursor carries its own order. Rows with
+                equal keys are kept in dataset order.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing pagination information.
+            `next_cursor` is None once the end of the dataset is reached.
+        """
+        assert isinstance(page_size, int) and page_size > 0
+        dataset = self.dataset()
+        indexed_data = self.indexed_dataset()
+        if cursor is None:
+            order = parse_order(order_by, dataset.header)
+            view = self.sorted_view(order)
+            pos = 0
+        else:
+            state = decode_cursor(cursor, CURSOR_FIELDS)
+            columns = len(dataset.header)
+            assert all(isinstance(pair, list) and len(pair) == 2
+                       and isinstance(pair[0], int) and 0 <= pair[0] < columns
+                       for pair in state['o']), "invalid cursor"
+            assert len(state['k']) == len(state['o']) and all(
+                isinstance(value, (str, int)) for value in state['k']), \
+                "invalid cursor"
+            order = tuple((int(c), bool(d)) for c, d in state['o'])
+            view = self.sorted_view(order)
+            last, pos = state['i'], state['p']
+            if (state['e'] != indexed_data.epoch or pos >= len(view.perm)
+                    or view.perm[pos] != last):
+                pos = view.resume(state['k'], last) - 1
+            pos += 1
+        # The next live rows in order, skipping deleted ones in O(log n)
+        live = self.live_order(order)
+        rank = live.rank(pos)
+        end = min(rank + page_size, len(live))
+        found = [live.select(k) for k in range(rank, end)]
+        keys = [view.perm[i] for i in found]
+        next_cursor = None
+        if keys and end < len(live):
+            next_cursor = encode_cursor({
+                'o': order,
+                'k': view.values(dataset, keys[-1]),
+                'i': keys[-1],
+                'p': found[-1],
+                'e': indexed_data.epoch,
+            })
+        return {
+            'cursor': cursor,
+            'next_cursor': next_cursor,
+            'page_size': len(keys),
+            'data': [indexed_data[key] for key in keys],
+        }
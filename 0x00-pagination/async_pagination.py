@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Asyncio-native pagination over the baby names dataset.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataset_backends import load_dataset
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+IndexServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class _HyperServer(HyperServer):
+    """Hypermedia Server paginating a dataset loaded by AsyncServer.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]]):
+        super().__init__()
+        self.__shared = dataset
+
+    def dataset(self) -> Sequence[List[str]]:
+        return self.__shared
+
+
+class _IndexServer(IndexServer):
+    """Deletion-resilient Server paginating a dataset loaded by
+    AsyncServer.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]]):
+        super().__init__()
+        self.__shared = dataset
+
+    def dataset(self) -> Sequence[List[str]]:
+        return self.__shared
+
+
+class AsyncServer:
+    """Async Server class to paginate a database of popular baby names.
+
+    The dataset is loaded in a worker thread, so the event loop keeps
+    serving while the file is read, and concurrent first requests all
+    await the same load. Pages are then served on the loop by the
+    synchronous servers, which share the loaded dataset.
+    """
+    DATA_FILE = "Popular_Baby_Names.csv"
+
+    def __init__(self, backend: str = "columnar"):
+        """Initializes a new AsyncServer instance.
+
+        Args:
+            backend (str): The dataset storage backend, see
+                `dataset_backends.BACKENDS`.
+        """
+        self.backend = backend
+        self.__dataset = None
+        self.__loading: Optional[asyncio.Future] = None
+        self.__hyper = None
+        self.__indexed = None
+
+    async def dataset(self) -> Sequence[List[str]]:
+        """Cached dataset, loaded once without blocking the event loop.
+
+        Returns:
+            Sequence[List[str]]: The dataset.
+        """
+        if self.__dataset is None:
+            if self.__loading is None:
+                self.__loading = asyncio.get_running_loop().run_in_executor(
+                    None, load_dataset, self.DATA_FILE, self.backend)
+            loading = self.__loading
+            try:
+                dataset = await asyncio.shield(loading)
+            except Exception:
+                if self.__loading is loading:
+                    self.__loading = None
+                raise
+            if self.__dataset is None:
+                self.__hyper = _HyperServer(dataset)
+                self.__indexed = _IndexServer(dataset)
+                self.__dataset = dataset
+        return self.__dataset
+
+    async def get_page(self, page: int = 1,
+                       page_size: int = 10) -> List[List[str]]:
+        """Retrieves a page of data.
+
+        Args:
+            page (int): The page number.
+            page_size (int): The number of items per page.
+
+        Returns:
+            List[List[str]]: The requested page of the dataset.
+        """
+        await self.dataset()
+        return self.__hyper.get_page(page, page_size)
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10,
+                        filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Get a hypermedia pagination dictionary.
+
+        Args:
+            page (int): The page number.
+            page_size (int): The number of items per page.
+            filters (Dict[str, Any]): Only page through the matching rows.
+                Indexes they need are built in a worker thread.
+
+        Returns:
+            Dict[str, Any]: A dictionary with pagination details.
+        """
+        await self.dataset()
+        if filters:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.__hyper.index().select, filters)
+        return self.__hyper.get_hyper(page, page_size, filters)
+
+    async def get_hyper_index(self, index: int = None,
+                              page_size: int = 10) -> Dict[str, Any]:
+        """Retrieves a page of data with deletion-resilience.
+
+        Args:
+            index (int): The starting index for the page.
+            page_size (int): The number of items to return.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing pagination information.
+        """
+        await self.dataset()
+        return self.__indexed.get_hyper_index(index, page_size)
+
+    async def indexed_dataset(self) -> Dict[int, List[str]]:
+        """Dataset indexed by sorting position, starting at 0.
+
+        Returns:
+            Dict[int, List[str]]: The indexed dataset.
+        """
+        await self.dataset()
+        return self.__indexed.indexed_dataset()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Load generator: many concurrent clients paging through an AsyncServer
+from a cold start, reporting throughput and p50/p99 latency.
+
+Usage: ./bench_async.py [--clients N] [--requests N] [--backend NAME]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from async_pagination import AsyncServer
+
+
+async def client(server: AsyncServer, requests: int, seed: int,
+                 latencies: List[float], cold: List[float]) -> None:
+    """Issues `requests` random page requests, one after the other. The
+    first one, which may wait for the dataset to load, goes to `cold`.
+    """
+    rng = random.Random(seed)
+    for i in range(requests):
+        kind = rng.randrange(3)
+        start = time.perf_counter()
+        if kind == 0:
+            await server.get_page(rng.randint(1, 1900), 10)
+        elif kind == 1:
+            await server.get_hyper(rng.randint(1, 1900), 10)
+        else:
+            await server.get_hyper_index(rng.randrange(19000), 10)
+        (latencies if i else cold).append(time.perf_counter() - start)
+        # Hand the loop over, like a client waiting on the network would.
+        await asyncio.sleep(0)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Returns the `pct` percentile of sorted `values`.
+    """
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def main() -> None:
+    """Runs the clients against one cold server and prints the summary.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--backend", default="columnar")
+    args = parser.parse_args()
+    server = AsyncServer(args.backend)
+    latencies: List[float] = []
+    cold: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(server, args.requests, seed, latencies, cold)
+        for seed in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    print("backend={} clients={} requests={} {:.0f} req/sec".format(
+        args.backend, args.clients, len(latencies) + len(cold),
+        (len(latencies) + len(cold)) / elapsed))
+    for label, values in (("first request", cold), ("warm", latencies)):
+        values.sort()
+        print("  {:<13} p50={:8.2f}ms p99={:8.2f}ms max={:8.2f}ms".format(
+            label, percentile(values, 50) * 1000,
+            percentile(values, 99) * 1000, values[-1] * 1000))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resident memory of the list-of-rows and columnar backends
+for the baby names dataset replicated to a large number of rows.
+
+Usage: ./bench_columnar.py [--rows N]
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from columnar_dataset import ColumnarDataset
+
+
+def rss_mb() -> float:
+    """Returns the current resident set size of this process in MiB.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_replicated(source: str, rows: int) -> str:
+    """Writes a temporary CSV holding `rows` rows cycled from `source`.
+    """
+    with open(source) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        data = list(reader)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        for i in range(rows):
+            writer.writerow(data[i % len(data)])
+    return path
+
+
+def child(backend: str, path: str) -> None:
+    """Loads the dataset with one backend and reports memory usage.
+    """
+    before = rss_mb()
+    start = time.perf_counter()
+    if backend == "list":
+        with open(path) as f:
+            dataset = [row for row in csv.reader(f)][1:]
+    else:
+        dataset = ColumnarDataset.from_csv(path)
+    elapsed = time.perf_counter() - start
+    after = rss_mb()
+    page = dataset[len(dataset) // 2:len(dataset) // 2 + 10]
+    assert len(page) == 10
+    print("{:<9} rows={:<10} load={:7.2f}s rss_before={:8.1f}MiB "
+          "rss_after={:8.1f}MiB delta={:8.1f}MiB".format(
+              backend, len(dataset), elapsed, before, after, after - before))
+
+
+def main() -> None:
+    """Runs every backend in a fresh interpreter on the same input.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--source", default="Popular_Baby_Names.csv")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+    path = write_replicated(args.source, args.rows)
+    try:
+        for backend in ("list", "columnar"):
+            subprocess.run([sys.executable, __file__, "--child", backend,
+                            path], check=True)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: get_hyper_index throughput with 0%, 50% and 99% of the rows
+deleted, walking the dataset page by page through `next_index`, and the
+cost of the deletions themselves.
+
+Usage: ./bench_hyper_index.py [--page-size N] [--replicate N]
+"""
+
+import argparse
+import random
+import time
+
+from columnar_dataset import ColumnarDataset
+
+Server = __import__('3-hypermedia_del_pagination').Server
+
+
+def walk(server: Server, page_size: int) -> int:
+    """Follows `next_index` from 0 to the end and returns the page count.
+    """
+    pages = 0
+    index = 0
+    while index is not None:
+        index = server.get_hyper_index(index, page_size)['next_index']
+        pages += 1
+    return pages
+
+
+def main() -> None:
+    """Reports ns/deletion and pages/sec for each deletion ratio.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--replicate", type=int, default=10)
+    args = parser.parse_args()
+    dataset = ColumnarDataset.from_csv(Server.DATA_FILE)
+    dataset = dataset.replicate(args.replicate)
+    rng = random.Random(0)
+    for ratio in (0.0, 0.5, 0.99):
+        server = Server()
+        server._Server__dataset = dataset
+        indexed = server.indexed_dataset()
+        keys = rng.sample(range(len(dataset)), int(len(dataset) * ratio))
+        start = time.perf_counter()
+        for key in keys:
+            del indexed[key]
+        deleting = time.perf_counter() - start
+        start = time.perf_counter()
+        pages = walk(server, args.page_size)
+        elapsed = time.perf_counter() - start
+        print("deleted={:>4.0%} live={:<8} {:6.0f} ns/deletion pages={:<7}"
+              " {:10.0f} pages/sec".format(
+                  ratio, len(indexed), deleting * 1e9 / max(len(keys), 1),
+                  pages, pages / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to the first page for the columnar and mmap backends
+on a replicated copy of the baby names dataset.
+
+Usage: ./bench_mmap.py [--rows N]
+"""
+
+import argparse
+import os
+import time
+
+from bench_columnar import write_replicated
+from dataset_backends import load_dataset
+
+
+def first_page(path: str, backend: str) -> float:
+    """Returns the seconds spent loading `path` and reading page 1.
+    """
+    start = time.perf_counter()
+    dataset = load_dataset(path, backend)
+    assert len(dataset[0:10]) == 10
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Compares cold starts, with and without a saved row index.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--source", default="Popular_Baby_Names.csv")
+    args = parser.parse_args()
+    path = write_replicated(args.source, args.rows)
+    try:
+        print("rows={} size={:.1f}MiB".format(
+            args.rows, os.path.getsize(path) / 2 ** 20))
+        print("columnar      {:8.3f}s".format(first_page(path, "columnar")))
+        print("mmap (build)  {:8.3f}s".format(first_page(path, "mmap")))
+        print("mmap (sidecar){:8.3f}s".format(first_page(path, "mmap")))
+        with open(path, "a") as f:
+            f.write("2016,FEMALE,HISPANIC,Ada,10,1\n")
+        print("mmap (append) {:8.3f}s".format(first_page(path, "mmap")))
+    finally:
+        os.remove(path)
+        if os.path.exists(path + ".idx"):
+            os.remove(path + ".idx")
+
+
+if __name__ == "__main__":
+    main()
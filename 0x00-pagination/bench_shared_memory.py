@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check: memory of pre-forked workers with a private dataset
+each versus one dataset published in shared memory.
+
+Every worker builds a Server, touches `dataset()` and `indexed_dataset()`
+and serves a few pages, then reports its private memory. In shared mode
+the script fails unless all workers attached the same single segment.
+
+Usage: ./bench_shared_memory.py [--workers N] [--replicate N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from bench_columnar import write_replicated
+import shared_dataset
+
+Server = __import__('3-hypermedia_del_pagination').Server
+
+
+def private_kib() -> int:
+    """Returns the private (unshared) memory of this process in KiB.
+    """
+    total = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total
+
+
+def worker(path: str, backend: str, results: multiprocessing.Queue) -> None:
+    """Serves a few pages and reports (segment name, private KiB).
+    """
+    before = private_kib()
+    server = Server(backend)
+    server.DATA_FILE = path
+    dataset = server.dataset()
+    server.indexed_dataset()
+    for index in range(0, len(dataset), max(1, len(dataset) // 50)):
+        server.get_hyper_index(index, 10)
+    segment = getattr(dataset, "segment", None)
+    results.put((segment.name if segment else None, private_kib() - before))
+
+
+def run(path: str, backend: str, workers: int) -> list:
+    """Forks `workers` processes using one backend and collects reports.
+    """
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(path, backend, results))
+             for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    reports = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return reports
+
+
+def main() -> None:
+    """Compares private and shared datasets across workers.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--replicate", type=int, default=20)
+    args = parser.parse_args()
+    tmp = tempfile.mkdtemp()
+    source = write_replicated(Server.DATA_FILE, 19418 * args.replicate)
+    path = os.path.join(tmp, "names.csv")
+    shutil.move(source, path)
+    try:
+        reports = run(path, "columnar", args.workers)
+        print("private: {} workers, {:8.1f}MiB private memory in total"
+              .format(len(reports), sum(r[1] for r in reports) / 1024))
+        segment = shared_dataset.publish(path)
+        try:
+            reports = run(path, "shared", args.workers)
+        finally:
+            segment.close()
+            segment.unlink()
+        names = {name for name, _ in reports}
+        print("shared:  {} workers, {:8.1f}MiB private memory in total, "
+              "{:.1f}MiB segment".format(
+                  len(reports), sum(r[1] for r in reports) / 1024,
+                  segment.size / 2 ** 20))
+        assert names == {segment.name}, names
+        print("OK: all {} workers attached segment {}".format(
+            len(reports), segment.name))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Server startup time when parsing the CSV versus mapping a
+binary snapshot of it.
+
+Usage: ./bench_snapshot.py [--rows N] [--restarts N]
+"""
+
+import argparse
+import os
+import time
+
+from bench_columnar import write_replicated
+from columnar_dataset import ColumnarDataset
+import snapshot
+
+
+def main() -> None:
+    """Times a parse, a snapshot build and repeated snapshot loads.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--restarts", type=int, default=20)
+    parser.add_argument("--source", default="Popular_Baby_Names.csv")
+    args = parser.parse_args()
+    path = write_replicated(args.source, args.rows)
+    snap = path + ".snap"
+    try:
+        start = time.perf_counter()
+        dataset = ColumnarDataset.from_csv(path)
+        print("parse          {:8.3f}s".format(time.perf_counter() - start))
+        start = time.perf_counter()
+        snapshot.save_snapshot(dataset, path, snap)
+        print("write snapshot {:8.3f}s ({:.1f}MiB)".format(
+            time.perf_counter() - start, os.path.getsize(snap) / 2 ** 20))
+        start = time.perf_counter()
+        for _ in range(args.restarts):
+            loaded = snapshot.load_snapshot(path, snap)
+            assert loaded[len(loaded) - 1] == dataset[len(dataset) - 1]
+        print("load snapshot  {:8.3f}ms per restart".format(
+            (time.perf_counter() - start) * 1000 / args.restarts))
+    finally:
+        os.remove(path)
+        if os.path.exists(snap):
+            os.remove(snap)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: load time and pages/sec of the pure-Python columnar backend
+and the vectorized NumPy/pyarrow backend, on the shipped CSV and on a
+100x synthetic blow-up.
+
+Usage: ./bench_vectorized.py [--blowup N] [--pages N] [--page-size N]
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+
+from bench_columnar import write_replicated
+from dataset_backends import load_dataset
+import vectorized_dataset
+
+Server = __import__('2-hypermedia_pagination').Server
+
+
+def run(path: str, backend: str, pages: int, page_size: int) -> None:
+    """Loads `path` with one backend and reports page throughput.
+    """
+    server = Server(backend)
+    server.DATA_FILE = path
+    start = time.perf_counter()
+    server.dataset()
+    load = time.perf_counter() - start
+    total = server.total_pages(page_size)
+    rng = random.Random(0)
+    requests = [(rng.randint(1, total), page_size) for _ in range(pages)]
+    start = time.perf_counter()
+    for page, size in requests:
+        server.get_page(page, size)
+    single = pages / (time.perf_counter() - start)
+    start = time.perf_counter()
+    server.get_pages(requests)
+    batched = pages / (time.perf_counter() - start)
+    print("{:<10} rows={:<9} load={:7.3f}s get_page={:9.0f} pages/sec "
+          "get_pages={:9.0f} pages/sec".format(
+              backend, server.row_count(), load, single, batched))
+
+
+def main() -> None:
+    """Runs both backends on the original and the blown-up dataset.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blowup", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    if not vectorized_dataset.available():
+        print("NumPy is not installed: 'vectorized' falls back to the "
+              "columnar loader")
+    with open(Server.DATA_FILE) as f:
+        rows = sum(1 for _ in csv.reader(f)) - 1
+    big = write_replicated(Server.DATA_FILE, rows * args.blowup)
+    try:
+        for path in (Server.DATA_FILE, big):
+            for backend in ("columnar", "vectorized"):
+                run(path, backend, args.pages, args.page_size)
+    finally:
+        os.remove(big)
+
+
+if __name__ == "__main__":
+    main()
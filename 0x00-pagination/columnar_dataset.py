@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Column-oriented, memory-compact storage for the baby names dataset.
+"""
+
+import csv
+import sys
+from array import array
+from typing import Iterator, List, Sequence, Union
+
+
+SCHEMA = ("category", "category", "category", "text", "int", "int")
+
+
+class ColumnarDataset(Sequence):
+    """Read-only sequence of dataset rows stored column by column.
+
+    Categorical columns (Year of Birth, Gender, Ethnicity) keep one
+    interned string per distinct value plus a compact code array, the
+    Count and Rank columns are unsigned integer arrays and the names are
+    packed into a single UTF-8 buffer addressed by an offset array.
+    Rows are only built as lists of strings when they are requested.
+    `postings` holds the row positions of every categorical value when
+    they are known, e.g. for datasets loaded from a snapshot.
+    """
+
+    def __init__(self, header: List[str], categories: List[List[str]],
+                 codes: List[array], names: bytes, name_offsets: array,
+                 ints: List[array]):
+        """Initializes a dataset from already built columns.
+
+        Args:
+            header (List[str]): The CSV column names.
+            categories (List[List[str]]): Distinct values of each
+                categorical column, indexed by code.
+            codes (List[array]): Per-row codes of each categorical column.
+            names (bytes): The packed UTF-8 encoded name column.
+            name_offsets (array): Start offset of every name in `names`,
+                followed by the total length.
+            ints (List[array]): The integer columns.
+        """
+        self.header = header
+        self.categories = categories
+        self.codes = codes
+        self.names = names
+        self.name_offsets = name_offsets
+        self.ints = ints
+        self.postings = {}
+        self.__length = len(name_offsets) - 1
+        self.__layout = []
+        cat = num = 0
+        for kind in SCHEMA:
+            if kind == "category":
+                self.__layout.append((kind, cat))
+                cat += 1
+            elif kind == "int":
+                self.__layout.append((kind, num))
+                num += 1
+            else:
+                self.__layout.append((kind, 0))
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ColumnarDataset":
+        """Parses a CSV file straight into columns, without ever holding
+        the whole file as a list of rows.
+
+        Args:
+            path (str): The CSV file to load.
+
+        Returns:
+            ColumnarDataset: The loaded dataset.
+        """
+        with open(path) as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            return cls.from_rows(reader, header)
+
+    @classmethod
+    def from_rows(cls, rows: Iterator[List[str]],
+                  header: List[str]) -> "ColumnarDataset":
+        """Builds a dataset from an iterable of string rows.
+
+        Args:
+            rows (Iterator[List[str]]): The rows, without the header.
+            header (List[str]): The CSV column names.
+
+        Returns:
+            ColumnarDataset: The built dataset.
+        """
+        cat_cols = [c for c, kind in enumerate(SCHEMA) if kind == "category"]
+        int_cols = [c for c, kind in enumerate(SCHEMA) if kind == "int"]
+        name_col = SCHEMA.index("text")
+        lookups = [{} for _ in cat_cols]
+        categories = [[] for _ in cat_cols]
+        codes = [array("H") for _ in cat_cols]
+        ints = [array("I") for _ in int_cols]
+        names = bytearray()
+        name_offsets = array("I", [0])
+        for row in rows:
+            for i, c in enumerate(cat_cols):
+                value = row[c]
+                code = lookups[i].get(value)
+                if code is None:
+                    code = lookups[i][value] = len(categories[i])
+                    categories[i].append(sys.intern(value))
+                codes[i].append(code)
+            for i, c in enumerate(int_cols):
+                ints[i].append(int(row[c]))
+            names += row[name_col].encode("utf-8")
+            name_offsets.append(len(names))
+        codes = [
+            array("B", col) if len(categories[i]) <= 0xFF else col
+            for i, col in enumerate(codes)
+        ]
+        return cls(header, categories, codes, bytes(names), name_offsets, ints)
+
+    def replicate(self, times: int) -> "ColumnarDataset":
+        """Returns a new dataset made of `times` copies of this one.
+
+        Args:
+            times (int): The number of copies.
+
+        Returns:
+            ColumnarDataset: The replicated dataset.
+        """
+        size = self.name_offsets[-1]
+        offsets = array(self.name_offsets.typecode, self.name_offsets)
+        base = self.name_offsets[1:]
+        for k in range(1, times):
+            shift = k * size
+            offsets.extend(offset + shift for offset in base)
+        return ColumnarDataset(
+            self.header, self.categories,
+            [col * times for col in self.codes],
+            self.names * times, offsets,
+            [col * times for col in self.ints],
+        )
+
+    def value(self, index: int, column: int) -> Union[str, int]:
+        """Retrieves a single typed value.
+
+        Args:
+            index (int): The row position.
+            column (int): The column position.
+
+        Returns:
+            Union[str, int]: The value, as an int for integer columns.
+        """
+        kind, pos = self.__layout[column]
+        if kind == "category":
+            return self.categories[pos][self.codes[pos][index]]
+        if kind == "int":
+            return self.ints[pos][index]
+        offsets = self.name_offsets
+        return str(self.names[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def row(self, index: int) -> List[str]:
+        """Builds the CSV row stored at a given position.
+
+        Args:
+            index (int): The row position.
+
+        Returns:
+            List[str]: The row, as the csv module would have returned it.
+        """
+        return [
+            str(self.value(index, c)) if kind == "int"
+            else self.value(index, c)
+            for c, kind in enumerate(SCHEMA)
+        ]
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for i in range(len(self)):
+            yield self.row(i)
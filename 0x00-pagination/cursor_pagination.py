@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Keyset (cursor) pagination helpers: precomputed sort orders and opaque
+cursors.
+"""
+
+import base64
+import binascii
+import json
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+
+def parse_order(order_by: Sequence[str],
+                header: List[str]) -> Tuple[Tuple[int, bool], ...]:
+    """Turns an order specification into column positions and directions.
+
+    Args:
+        order_by (Sequence[str]): Column names, each optionally followed
+            by "asc" or "desc", e.g. ["Count desc", "Child's First Name"].
+        header (List[str]): The dataset column names.
+
+    Returns:
+        Tuple[Tuple[int, bool], ...]: (column, descending) pairs.
+    """
+    columns = {name.lower(): i for i, name in enumerate(header)}
+    order = []
+    for spec in order_by:
+        name, _, direction = spec.strip().rpartition(" ")
+        if direction.lower() not in ("asc", "desc"):
+            name, direction = spec.strip(), "asc"
+        column = columns.get(name.strip().lower())
+        assert column is not None, "unknown column: {}".format(name)
+        order.append((column, direction.lower() == "desc"))
+    return tuple(order)
+
+
+def typed_value(dataset: Sequence[List[str]], position: int,
+                column: int) -> Union[str, int]:
+    """Reads one value of a dataset, numbers as ints.
+
+    Args:
+        dataset (Sequence[List[str]]): The dataset rows.
+        position (int): The row position.
+        column (int): The column position.
+
+    Returns:
+        Union[str, int]: The value.
+    """
+    if hasattr(dataset, "value"):
+        value = dataset.value(position, column)
+    else:
+        value = dataset[position][column]
+    return int(value) if isinstance(value, str) and value.isdigit() else value
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Encodes a cursor state into an opaque URL-safe token.
+    """
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str,
+                  fields: Dict[str, type] = None) -> Dict[str, Any]:
+    """Decodes a token made by `encode_cursor`.
+
+    Args:
+        cursor (str): The token.
+        fields (Dict[str, type]): The fields the state must have, with
+            their types; integers must not be booleans.
+
+    Returns:
+        Dict[str, Any]: The state.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (binascii.Error, ValueError):
+        state = None
+    assert isinstance(state, dict), "invalid cursor"
+    for name, kind in (fields or {}).items():
+        value = state.get(name)
+        assert isinstance(value, kind) and not (
+            kind is int and isinstance(value, bool)), "invalid cursor"
+    return state
+
+
+class SortedView:
+    """Dataset positions sorted once by a given order.
+
+    Every ordered column is reduced to dense integer ranks, so the sort
+    key of a row is a tuple of ints ending with its position. The sorted
+    keys are kept, so the permutation is searched with `bisect` instead
+    of being re-sorted.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]],
+                 order: Tuple[Tuple[int, bool], ...]):
+        """Sorts the positions of a dataset.
+
+        Args:
+            dataset (Sequence[List[str]]): The dataset rows.
+            order (Tuple[Tuple[int, bool], ...]): (column, descending)
+                pairs, as returned by `parse_order`.
+        """
+        self.order = order
+        self.__ranks = []
+        self.__lookups = []
+        for column, descending in order:
+            values = [typed_value(dataset, i, column)
+                      for i in range(len(dataset))]
+            distinct = sorted(set(values))
+            sign = -1 if descending else 1
+            lookup = {value: sign * r for r, value in enumerate(distinct)}
+            self.__lookups.append(lookup)
+            self.__ranks.append(array("l", (lookup[v] for v in values)))
+        self.__keys = sorted(self.key(i) for i in range(len(dataset)))
+        self.perm = array("q", (key[-1] for key in self.__keys))
+
+    def key(self, position: int) -> Tuple[int, ...]:
+        """Returns the sort key of a dataset position.
+        """
+        return tuple(ranks[position] for ranks in self.__ranks) + (position,)
+
+    def values(self, dataset: Sequence[List[str]],
+               position: int) -> List[Union[str, int]]:
+        """Returns the ordered column values of a position, as stored in
+        a cursor.
+        """
+        return [typed_value(dataset, position, c) for c, _ in self.order]
+
+    def resume(self, values: List[Union[str, int]], position: int) -> int:
+        """Finds where to continue after the row with the given ordered
+        column values and position.
+
+        Args:
+            values (List[Union[str, int]]): The ordered column values of
+                the last row served.
+            position (int): The dataset position of that row.
+
+        Returns:
+            int: The index in `perm` of the first row after it.
+        """
+        key = []
+        for lookup, value in zip(self.__lookups, values):
+            assert value in lookup, "stale cursor"
+            key.append(lookup[value])
+        key.append(position)
+        return bisect_right(self.__keys, tuple(key))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Registry of the storage backends a pagination Server can load its
+dataset with.
+"""
+
+from typing import Callable, Dict, List, Sequence
+
+from columnar_dataset import ColumnarDataset
+from mmap_dataset import MmapDataset
+import shared_dataset
+import snapshot
+import vectorized_dataset
+
+
+def load_vectorized(path: str) -> Sequence[List[str]]:
+    """Loads a dataset with NumPy (and pyarrow, if installed), falling
+    back to the pure-Python columnar loader without NumPy.
+    """
+    if vectorized_dataset.available():
+        return vectorized_dataset.VectorizedDataset.from_csv(path)
+    return ColumnarDataset.from_csv(path)
+
+
+BACKENDS: Dict[str, Callable[[str], Sequence[List[str]]]] = {
+    "columnar": ColumnarDataset.from_csv,
+    "mmap": MmapDataset,
+    "vectorized": load_vectorized,
+    "snapshot": snapshot.load_or_build,
+    "shared": shared_dataset.attach_or_load,
+}
+
+
+def load_dataset(path: str, backend: str = "columnar") -> Sequence[List[str]]:
+    """Loads a CSV dataset, without its header, with a given backend.
+
+    Args:
+        path (str): The CSV file to load.
+        backend (str): The name of a backend registered in `BACKENDS`.
+
+    Returns:
+        Sequence[List[str]]: The dataset rows.
+    """
+    assert backend in BACKENDS, "unknown dataset backend: {}".format(backend)
+    return BACKENDS[backend](path)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Deletion-aware mapping from dataset positions to rows.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from typing import (
+    Dict, Iterator, List, MutableMapping, Optional, Sequence, Tuple
+)
+
+
+class LiveSet:
+    """The integers of `range(size)` that are still live.
+
+    Deleted integers are tombstoned in a byte array, and a Fenwick tree
+    counts the live ones, so deleting, restoring, counting the live
+    integers below a bound (`rank`) and finding the k-th live integer
+    (`select`) all take O(log size). Until the first change every integer
+    is live and neither array is allocated.
+    """
+
+    def __init__(self, size: int, alive: Optional[bytearray] = None):
+        """Creates the set.
+
+        Args:
+            size (int): The number of integers.
+            alive (Optional[bytearray]): 1 for every live integer and 0
+                for every deleted one, all live if None.
+        """
+        self.size = size
+        self.__alive = None
+        self.__tree = None
+        self.__len = size
+        if alive is not None:
+            self.__build(alive)
+
+    def __build(self, alive: bytearray) -> None:
+        """Builds the tombstones and the tree in O(size).
+        """
+        self.__alive = alive
+        tree = array("q", [0])
+        tree.extend(alive)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.__tree = tree
+        self.__len = sum(alive)
+
+    def __update(self, value: int, delta: int) -> None:
+        """Adds delta to the count of value.
+        """
+        if self.__tree is None:
+            self.__build(bytearray(b"\x01") * self.size)
+        self.__alive[value] += delta
+        self.__len += delta
+        i = value + 1
+        tree = self.__tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def discard(self, value: int) -> bool:
+        """Deletes value, returning whether it was live.
+        """
+        if value not in self:
+            return False
+        self.__update(value, -1)
+        return True
+
+    def add(self, value: int) -> bool:
+        """Restores value, returning whether it was deleted.
+        """
+        if not 0 <= value < self.size or value in self:
+            return False
+        self.__update(value, 1)
+        return True
+
+    def rank(self, value: int) -> int:
+        """Returns the number of live integers lower than value.
+        """
+        i = min(max(value, 0), self.size)
+        if self.__tree is None:
+            return i
+        count = 0
+        tree = self.__tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def select(self, k: int) -> int:
+        """Returns the live integer of rank k, for 0 <= k < len(self).
+        """
+        if self.__tree is None:
+            return k
+        pos = 0
+        tree = self.__tree
+        step = 1 << self.size.bit_length()
+        while step:
+            if pos + step <= self.size and tree[pos + step] <= k:
+                pos += step
+                k -= tree[pos]
+            step >>= 1
+        return pos
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int) or not 0 <= value < self.size:
+            return False
+        return self.__alive is None or self.__alive[value] == 1
+
+    def __iter__(self) -> Iterator[int]:
+        if self.__alive is None:
+            return iter(range(self.size))
+        alive = self.__alive
+        return (i for i in range(self.size) if alive[i])
+
+    def __len__(self) -> int:
+        return self.__len
+
+
+class IndexedDataset(MutableMapping):
+    """Maps every live dataset position to its row.
+
+    The positions of the dataset are kept in a `LiveSet`, so deleting a
+    row only tombstones its position, and the next `count` live rows
+    from any position are found in O(count log n) whatever the number of
+    deleted rows. Keys outside the dataset, if any are set, are kept in
+    a sorted array. Rows are read from the underlying dataset on access.
+    `epoch` is bumped by every deletion or insertion.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]]):
+        """Indexes every row of a dataset by its position.
+
+        Args:
+            dataset (Sequence[List[str]]): The rows to index.
+        """
+        self.__dataset = dataset
+        self.__live = LiveSet(len(dataset))
+        self.__extra = array("q")  # Live keys outside the dataset
+        self.__rows: Dict[int, List[str]] = {}
+        self.__tracked: List[Tuple[array, LiveSet]] = []
+        self.epoch = 0
+
+    def track(self, perm: Sequence[int]) -> LiveSet:
+        """Follows the live positions in another order.
+
+        Args:
+            perm (Sequence[int]): Every dataset position, in that order.
+
+        Returns:
+            LiveSet: The indexes in `perm` of the live positions, kept up
+            to date by later deletions and insertions.
+        """
+        size = self.__live.size
+        inverse = array("q", bytes(8 * size))
+        for i, position in enumerate(perm):
+            inverse[position] = i
+        alive = None
+        if len(self.__live) < size:
+            alive = bytearray(position in self.__live for position in perm)
+        live = LiveSet(size, alive)
+        self.__tracked.append((inverse, live))
+        return live
+
+    def __count_below(self, index: int) -> int:
+        """Returns the number of live keys lower than index.
+        """
+        return bisect_left(self.__extra, index) + self.__live.rank(index)
+
+    def next_live(self, index: int, count: int) -> Tuple[List[int], bool]:
+        """Finds the first `count` live positions greater than or equal
+        to `index`.
+
+        Args:
+            index (int): The position to start from.
+            count (int): The number of positions to return.
+
+        Returns:
+            Tuple[List[int], bool]: The positions, and whether more live
+            positions follow them.
+        """
+        live, extra = self.__live, self.__extra
+        keys = []
+        if index < 0:  # Keys set below the dataset
+            start = bisect_left(extra, index)
+            keys += extra[start:min(bisect_left(extra, 0), start + count)]
+        rank = live.rank(index)
+        end = min(rank + count - len(keys), len(live))
+        keys += [live.select(k) for k in range(rank, end)]
+        if len(keys) < count:  # Keys set after the dataset
+            start = bisect_left(extra, max(index, live.size))
+            keys += extra[start:start + count - len(keys)]
+        if not keys:
+            return keys, False
+        return keys, self.__count_below(keys[-1] + 1) < len(self)
+
+    def __getitem__(self, key: int) -> List[str]:
+        if key in self.__rows:
+            return self.__rows[key]
+        if key not in self:
+            raise KeyError(key)
+        return self.__dataset[key]
+
+    def __setitem__(self, key: int, row: List[str]) -> None:
+        if key not in self:
+            if 0 <= key < self.__live.size:
+                self.__live.add(key)
+                for inverse, live in self.__tracked:
+                    live.add(inverse[key])
+            else:
+                insort(self.__extra, key)
+            self.epoch += 1
+        self.__rows[key] = row
+
+    def __delitem__(self, key: int) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if self.__live.discard(key):
+            for inverse, live in self.__tracked:
+                live.discard(inverse[key])
+        else:
+            del self.__extra[bisect_left(self.__extra, key)]
+        self.__rows.pop(key, None)
+        self.epoch += 1
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.__live:
+            return True
+        if not isinstance(key, int) or 0 <= key < self.__live.size:
+            return False
+        pos = bisect_left(self.__extra, key)
+        return pos < len(self.__extra) and self.__extra[pos] == key
+
+    def __iter__(self) -> Iterator[int]:
+        extra = self.__extra
+        below = bisect_left(extra, 0)
+        yield from extra[:below]
+        yield from self.__live
+        yield from extra[below:]
+
+    def __len__(self) -> int:
+        return len(self.__live) + len(self.__extra)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped, offset-indexed access to a CSV file.
+"""
+
+import csv
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Iterator, List, Optional, Sequence, Union
+
+
+INDEX_MAGIC = b"BNIX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sHxxQQI")
+TAIL_SIZE = 4096
+
+
+class MmapDataset(Sequence):
+    """Read-only sequence of CSV rows backed by a memory-mapped file.
+
+    The byte offset of every row is kept in an array, so a row or a page
+    of rows is decoded straight from the mapping without parsing the rest
+    of the file. The offsets are saved to a sidecar file (`<csv>.idx` by
+    default) and reused by the next instance; when the CSV has only been
+    appended to, just the new tail is scanned. Fields must not contain
+    embedded newlines.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        """Maps a CSV file and loads or builds its row index.
+
+        Args:
+            path (str): The CSV file to map.
+            index_path (str): Where to keep the row offsets. Defaults to
+                the CSV path with an `.idx` suffix.
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.__file = None
+        self.__map = None
+        self.__size = 0
+        self.__offsets = array("Q")
+        self.__crc = 0
+        self.header = []
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Remaps the file and brings the row index up to date.
+
+        Rows appended since the last refresh are indexed incrementally;
+        a truncated or rewritten file is reindexed from scratch.
+
+        Returns:
+            int: The number of rows in the dataset.
+        """
+        size = os.path.getsize(self.path)
+        if self.__map is not None and size == self.__size:
+            return len(self)
+        self.close()
+        self.__file = open(self.path, "rb")
+        if size:
+            self.__map = mmap.mmap(self.__file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        self.__size = size
+        if not self.__offsets:
+            self.__offsets = self.__load_index()
+        elif (self.__offsets[-1] > size
+              or self.__tail_crc(self.__offsets[-1]) != self.__crc):
+            self.__offsets = array("Q")
+        if not self.__offsets or self.__offsets[-1] < size:
+            self.__extend_index()
+            self.__save_index()
+        header = self.__decode(0, self.__offsets[0])
+        self.header = header[0] if header else []
+        return len(self)
+
+    def close(self) -> None:
+        """Releases the mapping and the underlying file.
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __tail_crc(self, end: int) -> int:
+        """Checksums the bytes just before `end`, used to tell an
+        appended file from a rewritten one.
+        """
+        if not end:
+            return 0
+        return zlib.crc32(self.__map[max(0, end - TAIL_SIZE):end])
+
+    def __load_index(self) -> array:
+        """Reads the sidecar index if it still describes a prefix of the
+        mapped file, otherwise returns an empty index.
+        """
+        offsets = array("Q")
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, version, indexed, rows, crc = INDEX_HEADER.unpack(
+                    f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                    return offsets
+                if indexed > self.__size or self.__tail_crc(indexed) != crc:
+                    return offsets
+                offsets.fromfile(f, rows + 2)
+        except (OSError, EOFError, struct.error):
+            return array("Q")
+        self.__crc = crc
+        return offsets
+
+    def __save_index(self) -> None:
+        """Writes the row index next to the CSV file, if possible.
+        """
+        indexed = self.__offsets[-1]
+        self.__crc = self.__tail_crc(indexed)
+        tmp = "{}.{}.tmp".format(self.index_path, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                f.write(INDEX_HEADER.pack(
+                    INDEX_MAGIC, INDEX_VERSION, indexed, len(self),
+                    self.__crc))
+                self.__offsets.tofile(f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def __extend_index(self) -> None:
+        """Scans the unindexed tail of the file for row boundaries.
+
+        The index holds the header end, the start of every data row and
+        the end of the last row. The last indexed row is rescanned since
+        it may have been incomplete.
+        """
+        offsets = self.__offsets
+        buf, size = self.__map, self.__size
+        if len(offsets) > 2:
+            del offsets[-1]
+            pos = offsets.pop()
+        elif len(offsets) == 2 and buf[offsets[0] - 1:offsets[0]] == b"\n":
+            del offsets[-1]
+            pos = offsets[0]
+        else:
+            offsets = array("Q")
+            eol = buf.find(b"\n") if size else -1
+            pos = size if eol < 0 else eol + 1
+            offsets.append(pos)
+        while pos < size:
+            offsets.append(pos)
+            eol = buf.find(b"\n", pos)
+            pos = size if eol < 0 else eol + 1
+        offsets.append(pos)
+        self.__offsets = offsets
+
+    def __decode(self, start: int, end: int) -> List[List[str]]:
+        """Parses the rows stored between two byte offsets.
+        """
+        if start >= end:
+            return []
+        text = self.__map[start:end].decode("utf-8")
+        return list(csv.reader(text.splitlines()))
+
+    def __len__(self) -> int:
+        return max(len(self.__offsets) - 2, 0)
+
+    def __getitem__(self, index: Union[int, slice]):
+        offsets = self.__offsets
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return self.__decode(offsets[start + 1], offsets[stop + 1])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.__decode(offsets[index + 1], offsets[index + 2])[0]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Per-column posting-list indexes for filtered pagination.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from cursor_pagination import typed_value
+
+
+FilterKey = Tuple[Tuple[int, Tuple[Union[str, int], ...]], ...]
+
+
+class FilteredView(Sequence):
+    """Read-only sequence of the dataset rows at a list of positions.
+    """
+
+    def __init__(self, dataset: Sequence[List[str]], positions: array):
+        """Initializes a view over selected rows.
+
+        Args:
+            dataset (Sequence[List[str]]): The dataset rows.
+            positions (array): The sorted positions of the selected rows.
+        """
+        self.dataset = dataset
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.dataset[i] for i in self.positions[index]]
+        return self.dataset[self.positions[index]]
+
+
+class SecondaryIndex:
+    """Posting lists (sorted row positions) for every value of the
+    filtered columns.
+
+    A column is indexed the first time a filter uses it, unless the
+    dataset already carries its posting lists in `postings`. Combined
+    filters are answered by intersecting posting lists, smallest first,
+    and the most recent results are cached so their row count is known
+    without recomputing them. Lookups hold a lock, so the index can be
+    shared by threads.
+    """
+    CACHE_SIZE = 256
+
+    def __init__(self, dataset: Sequence[List[str]], header: List[str]):
+        """Initializes an empty index over a dataset.
+
+        Args:
+            dataset (Sequence[List[str]]): The dataset rows.
+            header (List[str]): The dataset column names.
+        """
+        self.dataset = dataset
+        self.__columns = {name.lower(): i for i, name in enumerate(header)}
+        self.__postings: Dict[int, Dict[Union[str, int], array]] = dict(
+            getattr(dataset, "postings", None) or {})
+        self.__results: "OrderedDict[FilterKey, array]" = OrderedDict()
+        self.__lock = threading.RLock()  # Guards postings and results
+
+    def postings(self, column: int) -> Dict[Union[str, int], array]:
+        """Returns the posting lists of a column, building them if needed.
+
+        Args:
+            column (int): The column position.
+
+        Returns:
+            Dict[Union[str, int], array]: The positions of every value.
+        """
+        with self.__lock:
+            return self.__build_postings(column)
+
+    def __build_postings(self, column: int) -> Dict[Union[str, int], array]:
+        """Returns the posting lists of a column, building them if needed.
+        """
+        postings = self.__postings.get(column)
+        if postings is None:
+            postings = {}
+            for i in range(len(self.dataset)):
+                value = typed_value(self.dataset, i, column)
+                positions = postings.get(value)
+                if positions is None:
+                    positions = postings[value] = array("q")
+                positions.append(i)
+            self.__postings[column] = postings
+        return postings
+
+    def key(self, filters: Dict[str, Any]) -> FilterKey:
+        """Normalizes filters into a hashable key.
+
+        Args:
+            filters (Dict[str, Any]): Column names mapped to a value, or
+                to a list of accepted values.
+
+        Returns:
+            FilterKey: Sorted (column, values) pairs.
+        """
+        key = []
+        for name, values in filters.items():
+            column = self.__columns.get(name.lower())
+            assert column is not None, "unknown column: {}".format(name)
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = (values,)
+            values = tuple(sorted({
+                int(v) if isinstance(v, str) and v.isdigit() else v
+                for v in values
+            }, key=str))
+            key.append((column, values))
+        return tuple(sorted(key))
+
+    def select(self, filters: Dict[str, Any]) -> array:
+        """Returns the sorted positions of the rows matching every filter.
+
+        Args:
+            filters (Dict[str, Any]): Column names mapped to a value, or
+                to a list of accepted values.
+
+        Returns:
+            array: The matching positions.
+        """
+        key = self.key(filters)
+        with self.__lock:
+            return self.__select(key)
+
+    def __select(self, key: FilterKey) -> array:
+        """Returns the sorted positions of the rows matching key.
+        """
+        result = self.__results.get(key)
+        if result is not None:
+            self.__results.move_to_end(key)
+            return result
+        lists = []
+        for column, values in key:
+            postings = self.__build_postings(column)
+            matches = [postings[v] for v in values if v in postings]
+            if len(matches) == 1:
+                lists.append(matches[0])
+            else:
+                lists.append(array("q", sorted(
+                    i for positions in matches for i in positions)))
+        lists.sort(key=len)
+        if not lists:
+            result = array("q", range(len(self.dataset)))
+        elif len(lists) == 1:
+            result = lists[0]
+        else:
+            common = set(lists[0]).intersection(*lists[1:])
+            result = array("q", sorted(common))
+        self.__results[key] = result
+        if len(self.__results) > self.CACHE_SIZE:
+            self.__results.popitem(last=False)
+        return result
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+One copy of the parsed dataset in shared memory for pre-forked workers.
+
+The parent process calls `publish()` once before forking; every worker
+then loads the "shared" backend, which attaches read-only views to the
+segment instead of parsing its own copy.
+"""
+
+import hashlib
+import os
+from multiprocessing import shared_memory
+from typing import Optional
+
+from columnar_dataset import ColumnarDataset
+import snapshot
+
+
+def segment_name(csv_path: str) -> str:
+    """Names the shared memory segment of a given version of a CSV file.
+
+    Args:
+        csv_path (str): The CSV file.
+
+    Returns:
+        str: The segment name.
+    """
+    stat = os.stat(csv_path)
+    key = "{}:{}:{}".format(
+        os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns)
+    return "bn_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def publish(csv_path: str) -> shared_memory.SharedMemory:
+    """Loads a CSV file once and copies it into a new shared memory
+    segment, laid out like a snapshot.
+
+    The caller owns the segment and should `close()` and `unlink()` it
+    when the workers are done.
+
+    Args:
+        csv_path (str): The CSV file.
+
+    Returns:
+        shared_memory.SharedMemory: The segment.
+    """
+    dataset = snapshot.load_or_build(csv_path)
+    if not dataset.postings:
+        dataset.postings = snapshot.category_postings(dataset)
+    image = snapshot.pack(*snapshot.dataset_buffers(dataset,
+                                                    dataset.postings))
+    segment = shared_memory.SharedMemory(
+        name=segment_name(csv_path), create=True, size=len(image))
+    segment.buf[:len(image)] = image
+    return segment
+
+
+def attach(csv_path: str) -> Optional[ColumnarDataset]:
+    """Maps the published segment of a CSV file, if there is one.
+
+    The returned dataset reads its columns through read-only views of the
+    segment and keeps the segment open in its `segment` attribute.
+
+    Args:
+        csv_path (str): The CSV file.
+
+    Returns:
+        Optional[ColumnarDataset]: The dataset, or None when no segment
+        was published for the current version of the file.
+    """
+    name = segment_name(csv_path)
+    try:
+        try:
+            segment = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the segment with the
+            # resource tracker, which forked workers share with the
+            # publisher, so the registration is a no-op for them.
+            segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    meta, buffers = snapshot.unpack(segment.buf.toreadonly())
+    dataset = snapshot.dataset_from_buffers(meta, buffers)
+    dataset.segment = segment
+    return dataset
+
+
+def attach_or_load(csv_path: str) -> ColumnarDataset:
+    """Attaches to the published segment of a CSV file, or loads a private
+    copy when none was published.
+
+    Args:
+        csv_path (str): The CSV file.
+
+    Returns:
+        ColumnarDataset: The dataset.
+    """
+    dataset = attach(csv_path)
+    if dataset is None:
+        dataset = snapshot.load_or_build(csv_path)
+    return dataset
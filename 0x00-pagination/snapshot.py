@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Versioned binary snapshots of a parsed ColumnarDataset and its
+categorical posting lists, loaded back with zero-copy memory mapping.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar_dataset import SCHEMA, ColumnarDataset
+from cursor_pagination import typed_value
+
+
+SNAPSHOT_MAGIC = b"BNSNAP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<6sHQ")
+ALIGNMENT = 8
+
+
+def source_key(path: str, digest: bool = True) -> Dict[str, Any]:
+    """Identifies the version of a CSV file a snapshot was built from.
+
+    Args:
+        path (str): The CSV file.
+        digest (bool): Whether to hash the file contents as well.
+
+    Returns:
+        Dict[str, Any]: Its size, modification time and SHA-256 digest.
+    """
+    stat = os.stat(path)
+    key = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if digest:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        key["sha256"] = sha.hexdigest()
+    return key
+
+
+def category_postings(
+        dataset: ColumnarDataset) -> Dict[int, Dict[Any, array]]:
+    """Builds the posting lists of every categorical column from its codes.
+
+    Args:
+        dataset (ColumnarDataset): The dataset.
+
+    Returns:
+        Dict[int, Dict[Any, array]]: Column position mapped to the sorted
+        row positions of each of its values.
+    """
+    postings = {}
+    cat = 0
+    for column, kind in enumerate(SCHEMA):
+        if kind != "category":
+            continue
+        lists = [array("q") for _ in dataset.categories[cat]]
+        for i, code in enumerate(dataset.codes[cat]):
+            lists[code].append(i)
+        postings[column] = {
+            typed_value(dataset, lst[0], column): lst for lst in lists if lst
+        }
+        cat += 1
+    return postings
+
+
+def dataset_buffers(dataset: ColumnarDataset,
+                    postings: Dict[int, Dict[Any, array]]
+                    ) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+    """Lays a dataset and posting lists out as a metadata dictionary plus
+    named buffers.
+
+    Returns:
+        Tuple[Dict[str, Any], List[Tuple[str, Any]]]: The metadata and the
+        (name, buffer) pairs, in storage order.
+    """
+    buffers = [("names", dataset.names),
+               ("name_offsets", dataset.name_offsets)]
+    buffers += [("codes.{}".format(i), col)
+                for i, col in enumerate(dataset.codes)]
+    buffers += [("ints.{}".format(i), col)
+                for i, col in enumerate(dataset.ints)]
+    meta = {
+        "header": dataset.header,
+        "categories": dataset.categories,
+        "postings": {},
+    }
+    for column, lists in postings.items():
+        values = list(lists)
+        meta["postings"][str(column)] = values
+        buffers += [
+            ("postings.{}.{}".format(column, i), lists[value])
+            for i, value in enumerate(values)
+        ]
+    return meta, buffers
+
+
+def pack(meta: Dict[str, Any], buffers: List[Tuple[str, Any]]) -> bytes:
+    """Serializes metadata and buffers into one aligned binary image.
+
+    Each buffer is stored raw at an 8-byte aligned offset recorded, with
+    its item format, in the JSON metadata that follows the fixed header.
+    """
+    sections = []
+    offset = 0
+    for name, buf in buffers:
+        view = memoryview(buf)
+        sections.append([name, view.format, offset, view.nbytes])
+        offset += -(-view.nbytes // ALIGNMENT) * ALIGNMENT
+    meta = dict(meta, sections=sections)
+    raw_meta = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    raw_meta += b" " * (-(SNAPSHOT_HEADER.size + len(raw_meta)) % ALIGNMENT)
+    image = bytearray(SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(raw_meta)))
+    image += raw_meta
+    base = len(image)
+    image += bytes(offset)
+    for (name, buf), (_, _, start, nbytes) in zip(buffers, sections):
+        image[base + start:base + start + nbytes] = memoryview(buf).cast("B")
+    return bytes(image)
+
+
+def unpack(buf: Any) -> Tuple[Dict[str, Any], Dict[str, memoryview]]:
+    """Reads the metadata and zero-copy views of the buffers of an image
+    made by `pack`.
+
+    Raises:
+        ValueError: If the image is not a snapshot of this version.
+    """
+    view = memoryview(buf)
+    if len(view) < SNAPSHOT_HEADER.size:
+        raise ValueError("not a dataset snapshot")
+    magic, version, meta_size = SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("not a version {} dataset snapshot".format(
+            SNAPSHOT_VERSION))
+    base = SNAPSHOT_HEADER.size + meta_size
+    meta = json.loads(bytes(view[SNAPSHOT_HEADER.size:base]))
+    buffers = {
+        name: view[base + start:base + start + nbytes].cast(fmt)
+        for name, fmt, start, nbytes in meta["sections"]
+    }
+    return meta, buffers
+
+
+def dataset_from_buffers(meta: Dict[str, Any],
+                         buffers: Dict[str, memoryview]) -> ColumnarDataset:
+    """Rebuilds a ColumnarDataset, and its `postings`, over the views
+    returned by `unpack`.
+    """
+    n_cat = len(meta["categories"])
+    n_int = sum(1 for kind in SCHEMA if kind == "int")
+    dataset = ColumnarDataset(
+        meta["header"], meta["categories"],
+        [buffers["codes.{}".format(i)] for i in range(n_cat)],
+        buffers["names"], buffers["name_offsets"],
+        [buffers["ints.{}".format(i)] for i in range(n_int)],
+    )
+    dataset.postings = {
+        int(column): {
+            value: buffers["postings.{}.{}".format(column, i)]
+            for i, value in enumerate(values)
+        }
+        for column, values in meta["postings"].items()
+    }
+    return dataset
+
+
+def save_snapshot(dataset: ColumnarDataset, csv_path: str,
+                  snapshot_path: str) -> None:
+    """Writes a snapshot of a dataset loaded from `csv_path`, along with
+    the posting lists of its categorical columns.
+
+    Args:
+        dataset (ColumnarDataset): The parsed dataset.
+        csv_path (str): The CSV file it was parsed from.
+        snapshot_path (str): Where to write the snapshot.
+    """
+    if not dataset.postings:
+        dataset.postings = category_postings(dataset)
+    meta, buffers = dataset_buffers(dataset, dataset.postings)
+    meta["source"] = source_key(csv_path)
+    write_image(snapshot_path, pack(meta, buffers))
+
+
+def write_image(snapshot_path: str, image: bytes) -> None:
+    """Atomically replaces a snapshot file, so readers, including the
+    ones mapping the previous file, never see a partial image.
+    """
+    tmp = "{}.{}.tmp".format(snapshot_path, os.getpid())
+    with open(tmp, "wb") as f:
+        f.write(image)
+    os.replace(tmp, snapshot_path)
+
+
+def load_snapshot(csv_path: str,
+                  snapshot_path: str) -> Optional[ColumnarDataset]:
+    """Maps a snapshot if it was built from the current `csv_path`.
+
+    The size and modification time of the CSV are compared first; the
+    file is only hashed when they differ, e.g. after a copy or a touch,
+    and if the hash still matches the snapshot is rewritten with the new
+    modification time, so the next load does not hash it again.
+
+    Args:
+        csv_path (str): The CSV file the snapshot should match.
+        snapshot_path (str): The snapshot file.
+
+    Returns:
+        Optional[ColumnarDataset]: The dataset, or None when the snapshot
+        is missing, of another version or stale.
+    """
+    try:
+        with open(snapshot_path, "rb") as f:
+            image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        meta, buffers = unpack(image)
+    except (OSError, ValueError):
+        return None
+    key = source_key(csv_path, digest=False)
+    stored = meta.get("source", {})
+    if stored.get("size") != key["size"]:
+        return None
+    if stored.get("mtime_ns") != key["mtime_ns"]:
+        key = source_key(csv_path)
+        if stored.get("sha256") != key["sha256"]:
+            return None
+        meta = dict(meta, source=key)
+        sections = [(name, buffers[name])
+                    for name, _, _, _ in meta.pop("sections")]
+        try:
+            write_image(snapshot_path, pack(meta, sections))
+        except OSError:
+            pass
+    return dataset_from_buffers(meta, buffers)
+
+
+def load_or_build(csv_path: str,
+                  snapshot_path: Optional[str] = None) -> ColumnarDataset:
+    """Loads the snapshot of a CSV file, parsing the CSV and writing a new
+    snapshot when there is no valid one.
+
+    Args:
+        csv_path (str): The CSV file.
+        snapshot_path (str): The snapshot file. Defaults to the CSV path
+            with a `.snap` suffix.
+
+    Returns:
+        ColumnarDataset: The dataset.
+    """
+    snapshot_path = snapshot_path or csv_path + ".snap"
+    dataset = load_snapshot(csv_path, snapshot_path)
+    if dataset is None:
+        dataset = ColumnarDataset.from_csv(csv_path)
+        try:
+            save_snapshot(dataset, csv_path, snapshot_path)
+        except OSError:
+            pass
+    return dataset
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Vectorized loading and slicing of the baby names dataset with NumPy,
+reading the CSV with pyarrow when it is installed.
+"""
+
+import csv
+from typing import Any, Iterator, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pa_csv = None
+
+from columnar_dataset import SCHEMA
+
+
+def available() -> bool:
+    """Tells whether the vectorized backend can be used.
+    """
+    return np is not None
+
+
+def read_columns(path: str) -> Tuple[List[str], List[Any]]:
+    """Reads and encodes every column of a CSV file.
+
+    Categorical columns become (unique values, codes) pairs, integer
+    columns int32 arrays and the name column a string array.
+
+    Args:
+        path (str): The CSV file to read.
+
+    Returns:
+        Tuple[List[str], List[Any]]: The header and the columns.
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    if pa_csv is not None:
+        types = {
+            name: pa.int32() if kind == "int" else pa.string()
+            for name, kind in zip(header, SCHEMA)
+        }
+        table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+            column_types=types))
+        columns = []
+        for i, kind in enumerate(SCHEMA):
+            column = table.column(i).combine_chunks()
+            if kind == "category":
+                encoded = column.dictionary_encode()
+                categories = encoded.dictionary.to_numpy(
+                    zero_copy_only=False).astype(str)
+                columns.append((categories, encoded.indices.to_numpy()))
+            elif kind == "int":
+                columns.append(column.to_numpy())
+            else:
+                columns.append(
+                    column.to_numpy(zero_copy_only=False).astype(str))
+        return header, columns
+    data = np.loadtxt(path, dtype=str, delimiter=",", skiprows=1,
+                      quotechar='"', comments=None, ndmin=2)
+    columns = []
+    for i, kind in enumerate(SCHEMA):
+        if kind == "category":
+            columns.append(np.unique(data[:, i], return_inverse=True))
+        elif kind == "int":
+            columns.append(data[:, i].astype(np.int32))
+        else:
+            columns.append(data[:, i])
+    return header, columns
+
+
+class VectorizedDataset(Sequence):
+    """Read-only sequence of dataset rows stored as NumPy columns.
+
+    Categorical columns are stored as unique values plus small integer
+    codes, Count and Rank as int32 arrays and names as a fixed-width
+    string array. Pages are gathered with fancy indexing on every column
+    at once, and `take_ranges` gathers many pages in a single pass.
+    """
+
+    def __init__(self, header: List[str], columns: List[Any]):
+        """Initializes a dataset from encoded columns.
+
+        Args:
+            header (List[str]): The CSV column names.
+            columns (List[Any]): The columns, as returned by
+                `read_columns`.
+        """
+        self.header = header
+        self.columns = []
+        for kind, column in zip(SCHEMA, columns):
+            if kind == "category":
+                categories, codes = column
+                dtype = np.uint8 if len(categories) <= 0xFF else np.uint16
+                column = (categories, codes.astype(dtype))
+            self.columns.append(column)
+        self.__length = len(columns[-1]) if columns else 0
+
+    @classmethod
+    def from_csv(cls, path: str) -> "VectorizedDataset":
+        """Loads a CSV file with the vectorized readers.
+
+        Args:
+            path (str): The CSV file to load.
+
+        Returns:
+            VectorizedDataset: The loaded dataset.
+        """
+        return cls(*read_columns(path))
+
+    def value(self, index: int, column: int) -> Union[str, int]:
+        """Retrieves a single typed value.
+
+        Args:
+            index (int): The row position.
+            column (int): The column position.
+
+        Returns:
+            Union[str, int]: The value, as an int for integer columns.
+        """
+        kind = SCHEMA[column]
+        if kind == "category":
+            categories, codes = self.columns[column]
+            return str(categories[codes[index]])
+        if kind == "int":
+            return int(self.columns[column][index])
+        return str(self.columns[column][index])
+
+    def take(self, positions: "np.ndarray") -> List[List[str]]:
+        """Builds the rows at the given positions.
+
+        Args:
+            positions (np.ndarray): Integer row positions.
+
+        Returns:
+            List[List[str]]: The rows, as the csv module would have
+            returned them.
+        """
+        columns = []
+        for kind, column in zip(SCHEMA, self.columns):
+            if kind == "category":
+                categories, codes = column
+                columns.append(categories[codes[positions]].tolist())
+            else:
+                columns.append(column[positions].astype(str).tolist())
+        return [list(row) for row in zip(*columns)]
+
+    def take_ranges(self, ranges: List[Tuple[int, int]]
+                    ) -> List[List[List[str]]]:
+        """Builds many pages of rows in one vectorized gather.
+
+        Args:
+            ranges (List[Tuple[int, int]]): (start, end) position ranges,
+                already clipped to the dataset.
+
+        Returns:
+            List[List[List[str]]]: The rows of every range.
+        """
+        if not ranges:
+            return []
+        positions = np.concatenate([
+            np.arange(start, end, dtype=np.int64) for start, end in ranges
+        ])
+        rows = self.take(positions)
+        pages = []
+        offset = 0
+        for start, end in ranges:
+            pages.append(rows[offset:offset + end - start])
+            offset += end - start
+        return pages
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return self.take(np.arange(start, stop, step, dtype=np.int64))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.take(np.array([index]))[0]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for i in range(len(self)):
+            yield self[i]
@@ -12,16 +12,21 @@ class BasicCache(BaseCaching):
        and is a caching system
     '''
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         '''assign to the dictionary `self.cache_data` the
-           `item` value for the key `key`
+           `item` value for the key `key`, for `ttl` seconds
+           if given
         '''
         if key is not None and item is not None:
+            if self.expiry_heap:
+                self.expire()
             self.cache_data[key] = item
+            self._expire_at(key, ttl)
 
     def get(self, key):
         '''return the value in `self.cache_data` linked to `key`
         '''
-
+        if self.expires and self._expired(key):
+            return None
         return self.cache_data.get(key, None)
     
\ No newline at end of file
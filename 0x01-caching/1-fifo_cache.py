@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """ BaseCaching module
 """
+from collections import OrderedDict
 from base_caching import BaseCaching
 
 
@@ -9,33 +10,41 @@ class FIFOCache(BaseCaching):
     FIFOCache defines a FIFO caching system
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """
-        Initialize the class with the parent's init method
+        Initialize the class with the parent's init method, which takes
+        the capacity, and keep the items in an ordered dictionary, in
+        insertion order
         """
-        super().__init__()
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
-        Cache a key-value pair
+        Cache a key-value pair, for ttl seconds if given. Updating a
+        cached key keeps its place in the queue
         """
         if key is None or item is None:
-            pass
-        else:
-            length = len(self.cache_data)
-            if length >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                print("DISCARD: {}".format(self.order[0]))
-                del self.cache_data[self.order[0]]
-                del self.order[0]
-            self.order.append(key)
-            self.cache_data[key] = item
+            return
+        if self.expiry_heap:
+            self.expire()
+        size = self._item_size(item)
+        if self._too_large(size):
+            self._remove(key)
+            return
+        while self._over_capacity(key, size):
+            # The oldest key other than an updated one, which keeps its
+            # place and is only weighed at its new size
+            first_key = next(k for k in self.cache_data if k != key)
+            self._discard(first_key, self.cache_data.pop(first_key))
+        self.cache_data[key] = item
+        self._stored(key, size)
+        self._expire_at(key, ttl)
 
     def get(self, key):
         """
         Return the value linked to a given key, or None
         """
-        if key is not None and key in self.cache_data.keys():
-            return self.cache_data[key]
-        return None
-    
\ No newline at end of file
+        if self.expires and self._expired(key):
+            return None
+        return self.cache_data.get(key, None)
@@ -9,101 +9,127 @@ class LFUCache(BaseCaching):
     """Represents a caching system that allows storing and
     retrieving items with a Least Frequently Used (LFU)
     removal mechanism when the cache limit is reached.
+    Ties between equally used items are broken by recency:
+    the least recently used of them is removed first.
     """
 
-    def __init__(self):
-        """Initializes the LFUCache instance.
-        
-        Sets up the cache data structure as an ordered dictionary
-        and initializes a list to track the frequency of keys.
+    def __init__(self, *args, **kwargs):
+        """Initializes the LFUCache instance with the capacity
+        arguments of BaseCaching.
+
+        Sets up the cache data structure as an ordered dictionary,
+        a mapping from every key to its frequency, and one bucket per
+        frequency holding its keys from the least to the most recently
+        used. Tracking the lowest frequency in use makes every
+        operation run in constant time.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
-        self.keys_freq = []  
+        self.keys_freq = {}
+        self.freq_keys = {}
+        self.min_freq = 0
+
+    def __touch(self, key):
+        """Moves a key to the bucket of the next frequency.
+
+        Parameters:
+        key (str): The key that was accessed.
+        """
+        freq = self.keys_freq[key]
+        bucket = self.freq_keys[freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_keys[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.keys_freq[key] = freq + 1
+        self.freq_keys.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def __unlink(self, key):
+        """Removes a key from its frequency bucket.
 
-    def __reorder_items(self, mru_key):
-        """Reorders the frequency list based on the access of the
-        specified key, updating its frequency count.
-        
         Parameters:
-        mru_key (str): The key that was accessed, triggering the reorder.
+        key (str): The key to remove.
         """
-        max_positions = []
-        mru_freq = 0
-        mru_pos = 0
-        ins_pos = 0
-        
-        
-        for i, key_freq in enumerate(self.keys_freq):
-            if key_freq[0] == mru_key:
-                mru_freq = key_freq[1] + 1  
-                mru_pos = i
-                break
-            elif len(max_positions) == 0:
-                max_positions.append(i)
-            elif key_freq[1] < self.keys_freq[max_positions[-1]][1]:
-                max_positions.append(i)
-        
-        max_positions.reverse()
-        
-        
-        for pos in max_positions:
-            if self.keys_freq[pos][1] > mru_freq:
-                break
-            ins_pos = pos
-        
-        
-        self.keys_freq.pop(mru_pos)
-        self.keys_freq.insert(ins_pos, [mru_key, mru_freq])
-
-    def put(self, key, item):
+        freq = self.keys_freq.pop(key)
+        bucket = self.freq_keys[freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_keys[freq]
+
+    def _remove(self, key):
+        """Removes a key from the cache, if present, without
+        reporting it.
+
+        Parameters:
+        key (str): The key to remove.
+        """
+        if key in self.cache_data:
+            self.__unlink(key)
+        super()._remove(key)
+
+    def put(self, key, item, ttl=None):
         """Adds an item to the cache under the specified key.
-        
+
         If the cache exceeds the maximum allowed items,
         the least frequently used item is discarded.
-        
+
         Parameters:
         key (str): The key under which the item will be stored.
         item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
         """
         if key is None or item is None:
             return
-        
-        if key not in self.cache_data:
-            
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                lfu_key, _ = self.keys_freq[-1]
-                self.cache_data.pop(lfu_key)
-                self.keys_freq.pop()
-                print("DISCARD:", lfu_key)
-
-            
-            self.cache_data[key] = item
-            ins_index = len(self.keys_freq)
-            for i, key_freq in enumerate(self.keys_freq):
-                if key_freq[1] == 0: 
-                    ins_index = i
-                    break
-            self.keys_freq.insert(ins_index, [key, 0]) 
-        else:
-
-            self.cache_data[key] = item
-            self.__reorder_items(key)
+
+        if self.expiry_heap:
+            self.expire()
+
+        size = self._item_size(item)
+        if self._too_large(size):
+            self._remove(key)
+            return
+
+        freq = None
+        if key in self.cache_data:
+            # Take an updated key out of the eviction candidates until
+            # it is stored, one use more frequent
+            freq = self.keys_freq[key] + 1
+            self.__unlink(key)
+
+        while self._over_capacity(key, size):
+            if self.min_freq not in self.freq_keys:
+                # Several evictions in a row, or a removal, emptied
+                # the lowest bucket.
+                self.min_freq = min(self.freq_keys)
+            lfu_key = next(iter(self.freq_keys[self.min_freq]))
+            self.__unlink(lfu_key)
+            self._discard(lfu_key, self.cache_data.pop(lfu_key))
+
+        if freq is None:
+            freq = 0
+            self.min_freq = 0
+        self.keys_freq[key] = freq
+        self.freq_keys.setdefault(freq, OrderedDict())[key] = None
+        self.cache_data[key] = item
+        self._stored(key, size)
+        self._expire_at(key, ttl)
 
     def get(self, key):
         """Retrieves an item from the cache by its key.
-        
+
         If the key exists, it updates the frequency of the item.
-        
+
         Parameters:
         key (str): The key of the item to retrieve.
-        
+
         Returns:
         The value associated with the key, or None if the key does not exist.
         """
+        if self.expires and self._expired(key):
+            return None
         if key is not None and key in self.cache_data:
+            self.__touch(key)
 
-            self.__reorder_items(key)
-        
         return self.cache_data.get(key, None)
-    
\ No newline at end of file
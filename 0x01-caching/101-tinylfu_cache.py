@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Task 6: W-TinyLFU caching module.
+"""
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class CountMinSketch():
+    """Approximate access counts of an unbounded set of keys in a fixed
+    table of small saturating counters.
+
+    Every key owns one counter per row, and its count is the lowest of
+    them. Once `sample` increments have been recorded all counters are
+    halved, so that the counts follow changes in popularity.
+    """
+    DEPTH = 4
+    MIX = 0xBF58476D1CE4E5B9
+    MASK64 = (1 << 64) - 1
+    MAX_COUNT = 15
+    MIN_WIDTH = 64
+    HALF = bytes(count >> 1 for count in range(256))
+
+    def __init__(self, capacity):
+        """Sizes the table for a cache of `capacity` items.
+
+        Parameters:
+        capacity (int): The number of items of the cache.
+        """
+        self.width = 1 << max(capacity - 1, self.MIN_WIDTH - 1).bit_length()
+        self.table = bytearray(self.DEPTH * self.width)
+        self.sample = 10 * max(capacity, 1)
+        self.additions = 0
+
+    def __slots(self, key):
+        """Returns the position of the counter of a key in every row.
+
+        The hash of the key is mixed into 64 bits, whose halves give
+        the position in every row by double hashing.
+        """
+        h = hash(key) & self.MASK64
+        h = ((h ^ h >> 31) * self.MIX) & self.MASK64
+        h ^= h >> 29
+        mask = self.width - 1
+        width = self.width
+        first = h & mask
+        step = h >> 32 | 1
+        return (first,
+                width + (first + step & mask),
+                2 * width + (first + 2 * step & mask),
+                3 * width + (first + 3 * step & mask))
+
+    def frequency(self, key):
+        """Returns the estimated count of a key.
+        """
+        table = self.table
+        a, b, c, d = self.__slots(key)
+        return min(table[a], table[b], table[c], table[d])
+
+    def increment(self, key):
+        """Records an access to a key.
+        """
+        table = self.table
+        for slot in self.__slots(key):
+            if table[slot] < self.MAX_COUNT:
+                table[slot] += 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self.table = table.translate(self.HALF)
+            self.additions //= 2
+
+
+class TinyLFUCache(BaseCaching):
+    """Represents a caching system with a Window TinyLFU
+    removal mechanism when the cache limit is reached.
+
+    New items enter a small LRU window. The item leaving the window is
+    only admitted into the main cache if the frequency sketch estimates
+    it was used more often than the item the main cache would evict, so
+    one-hit wonders and scans cannot flush the frequently used items.
+    The main cache is a segmented LRU: items are put on probation and
+    promoted to the protected segment when used again.
+    """
+    WINDOW = 0.01
+    PROTECTED = 0.8
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the TinyLFUCache instance.
+
+        The capacity arguments are passed on to BaseCaching. The
+        cache is bounded by max_items only, which is split between
+        the window and the segments of the main cache.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("TinyLFUCache is bounded by max_items only")
+        self.window_size = max(1, int(self.max_items * self.WINDOW))
+        main_size = self.max_items - self.window_size
+        self.main_size = main_size
+        self.protected_size = int(main_size * self.PROTECTED)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(self.max_items)
+
+    def __touch(self, key):
+        """Records a hit on a cached key.
+
+        Parameters:
+        key (str): The key that was accessed.
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.protected_size:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def __admit(self, candidate):
+        """Moves the key leaving the window into the main cache, or
+        discards it.
+
+        Parameters:
+        candidate (str): The least recently used key of the window.
+        """
+        if len(self.probation) + len(self.protected) < self.main_size:
+            self.probation[candidate] = None
+            return
+        victims = self.probation or self.protected
+        if not victims:
+            victim = candidate
+        else:
+            victim = next(iter(victims))
+            if self.sketch.frequency(candidate) > \
+                    self.sketch.frequency(victim):
+                del victims[victim]
+                self.probation[candidate] = None
+            else:
+                victim = candidate
+        self._discard(victim, self.cache_data.pop(victim))
+
+    def _remove(self, key):
+        """Removes a key from the cache, if present, without
+        reporting it.
+
+        Parameters:
+        key (str): The key to remove.
+        """
+        for segment in (self.window, self.probation, self.protected):
+            segment.pop(key, None)
+        super()._remove(key)
+
+    def put(self, key, item, ttl=None):
+        """Adds an item to the cache under the specified key.
+
+        If the cache exceeds the maximum allowed items, either the
+        item leaving the window or the least recently used item on
+        probation is discarded, whichever was used less often.
+
+        Parameters:
+        key (str): The key under which the item will be stored.
+        item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
+        """
+        if key is None or item is None:
+            return
+
+        if self.expiry_heap:
+            self.expire()
+
+        self.sketch.increment(key)
+        if key in self.cache_data:
+            self.__touch(key)
+        else:
+            self.window[key] = None
+        self.cache_data[key] = item
+        self._expire_at(key, ttl)
+        if len(self.window) > self.window_size:
+            candidate, _ = self.window.popitem(last=False)
+            self.__admit(candidate)
+
+    def get(self, key):
+        """Retrieves an item from the cache by its key.
+
+        Every lookup, hit or miss, is counted by the frequency sketch.
+
+        Parameters:
+        key (str): The key of the item to retrieve.
+
+        Returns:
+        The value associated with the key, or None if the key does not exist.
+        """
+        if key is None:
+            return None
+        self.sketch.increment(key)
+        if self.expires and self._expired(key):
+            return None
+        if key in self.cache_data:
+            self.__touch(key)
+        return self.cache_data.get(key, None)
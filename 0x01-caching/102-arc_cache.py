@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Task 7: Adaptive Replacement Cache module.
+"""
+import sys
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """Represents a caching system with an Adaptive Replacement
+    Cache (ARC) removal mechanism when the cache limit is reached.
+
+    Cached keys are split between `recent`, seen once lately, and
+    `frequent`, seen at least twice, both ordered from the least to the
+    most recently used. The keys evicted from each of them are
+    remembered, without their items, in the ghost lists `recent_ghost`
+    and `frequent_ghost`. A miss on a ghost key shows which list was
+    evicted too early and moves `target`, the share of the capacity
+    given to `recent`, towards it, so the cache adapts between LRU for
+    point lookups and scan resistance.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the ARCCache instance.
+
+        The capacity arguments are passed on to BaseCaching. The
+        cache is bounded by max_items only; the ghost lists hold at
+        most as many keys again.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("ARCCache is bounded by max_items only")
+        self.recent = OrderedDict()
+        self.frequent = OrderedDict()
+        self.recent_ghost = OrderedDict()
+        self.frequent_ghost = OrderedDict()
+        self.target = 0
+        self.ghost_key_bytes = 0
+
+    def __ghost(self, ghosts, key):
+        """Remembers an evicted key in a ghost list.
+
+        Parameters:
+        ghosts (OrderedDict): The ghost list.
+        key (str): The evicted key.
+        """
+        ghosts[key] = None
+        self.ghost_key_bytes += sys.getsizeof(key)
+
+    def __unghost(self, ghosts, key=None):
+        """Forgets a ghost key, the oldest one by default.
+
+        Parameters:
+        ghosts (OrderedDict): The ghost list.
+        key (str): The ghost key to forget.
+        """
+        if key is None:
+            key, _ = ghosts.popitem(last=False)
+        else:
+            del ghosts[key]
+        self.ghost_key_bytes -= sys.getsizeof(key)
+
+    def ghost_memory(self):
+        """Returns the bytes used by the ghost lists, their keys
+        included.
+        """
+        return (sys.getsizeof(self.recent_ghost) +
+                sys.getsizeof(self.frequent_ghost) + self.ghost_key_bytes)
+
+    def __replace(self, key):
+        """Evicts the least recently used key of `recent` or of
+        `frequent`, depending on the target, into its ghost list.
+
+        Parameters:
+        key (str): The key about to be stored.
+        """
+        if len(self.cache_data) < self.max_items:
+            return
+        if self.recent and (not self.frequent or
+                            len(self.recent) > self.target or (
+                                key in self.frequent_ghost and
+                                len(self.recent) == self.target)):
+            old_key, _ = self.recent.popitem(last=False)
+            self.__ghost(self.recent_ghost, old_key)
+        else:
+            old_key, _ = self.frequent.popitem(last=False)
+            self.__ghost(self.frequent_ghost, old_key)
+        self._discard(old_key, self.cache_data.pop(old_key))
+
+    def _remove(self, key):
+        """Removes a key from the cache, if present, without
+        reporting it.
+
+        Parameters:
+        key (str): The key to remove.
+        """
+        self.recent.pop(key, None)
+        self.frequent.pop(key, None)
+        super()._remove(key)
+
+    def put(self, key, item, ttl=None):
+        """Adds an item to the cache under the specified key.
+
+        If the cache exceeds the maximum allowed items, the least
+        recently used key of either `recent` or `frequent` is
+        discarded, as chosen by the adaptive target.
+
+        Parameters:
+        key (str): The key under which the item will be stored.
+        item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
+        """
+        if key is None or item is None:
+            return
+
+        if self.expiry_heap:
+            self.expire()
+
+        capacity = self.max_items
+        if key in self.cache_data:
+            self.recent.pop(key, None)
+            self.frequent[key] = None
+            self.frequent.move_to_end(key)
+        elif key in self.recent_ghost:
+            step = max(len(self.frequent_ghost) / len(self.recent_ghost), 1)
+            self.target = min(capacity, self.target + step)
+            self.__replace(key)
+            self.__unghost(self.recent_ghost, key)
+            self.frequent[key] = None
+        elif key in self.frequent_ghost:
+            step = max(len(self.recent_ghost) / len(self.frequent_ghost), 1)
+            self.target = max(0, self.target - step)
+            self.__replace(key)
+            self.__unghost(self.frequent_ghost, key)
+            self.frequent[key] = None
+        else:
+            if len(self.recent) + len(self.recent_ghost) >= capacity:
+                if len(self.recent) < capacity:
+                    self.__unghost(self.recent_ghost)
+                    self.__replace(key)
+                else:
+                    old_key, _ = self.recent.popitem(last=False)
+                    self._discard(old_key, self.cache_data.pop(old_key))
+            else:
+                total = (len(self.cache_data) + len(self.recent_ghost) +
+                         len(self.frequent_ghost))
+                if total >= 2 * capacity and self.frequent_ghost:
+                    self.__unghost(self.frequent_ghost)
+                self.__replace(key)
+            self.recent[key] = None
+        self.cache_data[key] = item
+        self._expire_at(key, ttl)
+
+    def get(self, key):
+        """Retrieves an item from the cache by its key.
+
+        A hit moves the key to the most recently used end of
+        `frequent`.
+
+        Parameters:
+        key (str): The key of the item to retrieve.
+
+        Returns:
+        The value associated with the key, or None if the key does not exist.
+        """
+        if self.expires and self._expired(key):
+            return None
+        if key is None or key not in self.cache_data:
+            return None
+        self.recent.pop(key, None)
+        self.frequent[key] = None
+        self.frequent.move_to_end(key)
+        return self.cache_data[key]
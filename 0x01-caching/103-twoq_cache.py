@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Task 8: 2Q caching module.
+"""
+import sys
+from collections import OrderedDict
+from base_caching import BaseCaching
+
+
+class TwoQCache(BaseCaching):
+    """Represents a caching system with a 2Q removal mechanism
+    when the cache limit is reached.
+
+    New keys enter `incoming`, a FIFO queue holding a quarter of the
+    capacity, where hits do not reorder them. The keys it evicts are
+    remembered, without their items, in the `outgoing` ghost queue; a
+    key put again while it is still there is hot and goes to `hot`, an
+    LRU list holding the rest of the capacity. Keys seen only once,
+    such as scans, therefore never push hot keys out.
+    """
+    INCOMING = 0.25
+    OUTGOING = 0.5
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the TwoQCache instance.
+
+        The capacity arguments are passed on to BaseCaching. The
+        cache is bounded by max_items only; the ghost queue holds at
+        most half as many keys.
+        """
+        super().__init__(*args, **kwargs)
+        if self.max_bytes is not None:
+            raise ValueError("TwoQCache is bounded by max_items only")
+        self.incoming_size = max(1, int(self.max_items * self.INCOMING))
+        self.outgoing_size = max(1, int(self.max_items * self.OUTGOING))
+        self.incoming = OrderedDict()
+        self.outgoing = OrderedDict()
+        self.hot = OrderedDict()
+        self.ghost_key_bytes = 0
+
+    def ghost_memory(self):
+        """Returns the bytes used by the ghost queue, its keys
+        included.
+        """
+        return sys.getsizeof(self.outgoing) + self.ghost_key_bytes
+
+    def __reclaim(self):
+        """Makes room for one key, evicting from `incoming` while it
+        is over its share and from `hot` otherwise.
+        """
+        if len(self.cache_data) < self.max_items:
+            return
+        if len(self.incoming) > self.incoming_size or not self.hot:
+            old_key, _ = self.incoming.popitem(last=False)
+            self.outgoing[old_key] = None
+            self.ghost_key_bytes += sys.getsizeof(old_key)
+            if len(self.outgoing) > self.outgoing_size:
+                ghost, _ = self.outgoing.popitem(last=False)
+                self.ghost_key_bytes -= sys.getsizeof(ghost)
+        else:
+            old_key, _ = self.hot.popitem(last=False)
+        self._discard(old_key, self.cache_data.pop(old_key))
+
+    def _remove(self, key):
+        """Removes a key from the cache, if present, without
+        reporting it.
+
+        Parameters:
+        key (str): The key to remove.
+        """
+        self.incoming.pop(key, None)
+        self.hot.pop(key, None)
+        super()._remove(key)
+
+    def put(self, key, item, ttl=None):
+        """Adds an item to the cache under the specified key.
+
+        If the cache exceeds the maximum allowed items, the oldest
+        key of `incoming` is discarded when it holds more than its
+        share, the least recently used key of `hot` otherwise.
+
+        Parameters:
+        key (str): The key under which the item will be stored.
+        item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
+        """
+        if key is None or item is None:
+            return
+
+        if self.expiry_heap:
+            self.expire()
+
+        if key in self.hot:
+            self.hot.move_to_end(key)
+        elif key in self.outgoing:
+            del self.outgoing[key]
+            self.ghost_key_bytes -= sys.getsizeof(key)
+            self.__reclaim()
+            self.hot[key] = None
+        elif key not in self.incoming:
+            self.__reclaim()
+            self.incoming[key] = None
+        self.cache_data[key] = item
+        self._expire_at(key, ttl)
+
+    def get(self, key):
+        """Retrieves an item from the cache by its key.
+
+        A hit on a hot key makes it the most recently used one.
+
+        Parameters:
+        key (str): The key of the item to retrieve.
+
+        Returns:
+        The value associated with the key, or None if the key does not exist.
+        """
+        if self.expires and self._expired(key):
+            return None
+        if key is not None and key in self.hot:
+            self.hot.move_to_end(key)
+        return self.cache_data.get(key, None)
@@ -11,14 +11,16 @@ class LIFOCache(BaseCaching):
     removal mechanism when the cache limit is reached.
     """
     
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initializes the LIFOCache instance, setting up
         the cache data structure as an ordered dictionary.
+
+        The capacity arguments are passed on to BaseCaching.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Adds an item to the cache with the specified key.
         
         If the cache exceeds the maximum allowed items,
@@ -27,17 +29,31 @@ class LIFOCache(BaseCaching):
         Parameters:
         key (str): The key under which the item will be stored.
         item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
         """
         if key is None or item is None:
             return
-        
-        if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                last_key, _ = self.cache_data.popitem(True)
-                print("DISCARD:", last_key)
-        
+
+        if self.expiry_heap:
+            self.expire()
+
+        size = self._item_size(item)
+        if self._too_large(size):
+            self._remove(key)
+            return
+
+        # Take an updated key out of the eviction candidates; it is
+        # stored again below
+        self.cache_data.pop(key, None)
+        while self._over_capacity(key, size):
+            last_key, last_item = self.cache_data.popitem(True)
+            self._discard(last_key, last_item)
+
         self.cache_data[key] = item
         self.cache_data.move_to_end(key, last=True)
+        self._stored(key, size)
+        self._expire_at(key, ttl)
 
     def get(self, key):
         """Retrieves an item from the cache by its key.
@@ -45,5 +61,7 @@ class LIFOCache(BaseCaching):
         Returns:
         The value associated with the key, or None if the key does not exist.
         """
+        if self.expires and self._expired(key):
+            return None
         return self.cache_data.get(key, None)
     
\ No newline at end of file
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """ BaseCaching module
 """
+from collections import OrderedDict
 from base_caching import BaseCaching
 
 
@@ -10,38 +11,45 @@ class LRUCache(BaseCaching):
     This cache evicts the least recently used item when the cache exceeds
     its maximum size.
     """
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """
         Initialize the LRUCache instance.
-        Calls the parent class's initializer and sets up a list to track
-        the usage order of keys.
+        Calls the parent class's initializer with the capacity and keeps
+        the items in an ordered dictionary, from the least to the most
+        recently used, so every operation runs in constant time.
         """
-        super().__init__()
-        self.usage = []
+        super().__init__(*args, **kwargs)
+        self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """
-        Cache a key-value pair
+        Cache a key-value pair, for ttl seconds if given
         """
         if key is None or item is None:
-            pass
-        else:
-            length = len(self.cache_data)
-            if length >= BaseCaching.MAX_ITEMS and key not in self.cache_data:
-                print("DISCARD: {}".format(self.usage[0]))
-                del self.cache_data[self.usage[0]]
-                del self.usage[0]
-            if key in self.usage:
-                del self.usage[self.usage.index(key)]
-            self.usage.append(key)
-            self.cache_data[key] = item
+            return
+        if self.expiry_heap:
+            self.expire()
+        size = self._item_size(item)
+        if self._too_large(size):
+            self._remove(key)
+            return
+        if key in self.cache_data:
+            self.cache_data.move_to_end(key)
+        while self._over_capacity(key, size):
+            lru_key, lru_item = self.cache_data.popitem(last=False)
+            self._discard(lru_key, lru_item)
+        self.cache_data[key] = item
+        self.cache_data.move_to_end(key)
+        self._stored(key, size)
+        self._expire_at(key, ttl)
 
     def get(self, key):
         """
         Return the value linked to a given key, or None
         """
-        if key is not None and key in self.cache_data.keys():
-            del self.usage[self.usage.index(key)]
-            self.usage.append(key)
+        if self.expires and self._expired(key):
+            return None
+        if key is not None and key in self.cache_data:
+            self.cache_data.move_to_end(key)
             return self.cache_data[key]
-        return None
\ No newline at end of file
+        return None
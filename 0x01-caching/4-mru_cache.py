@@ -11,14 +11,16 @@ class MRUCache(BaseCaching):
     Most Recently Used (MRU) eviction policy.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initializes the MRUCache instance and sets up
         the cache data structure as an ordered dictionary.
+
+        The capacity arguments are passed on to BaseCaching.
         """
-        super().__init__()
+        super().__init__(*args, **kwargs)
         self.cache_data = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Adds an item to the cache under the specified key.
         
         If the cache exceeds the maximum allowed items,
@@ -27,18 +29,31 @@ class MRUCache(BaseCaching):
         Parameters:
         key (str): The key under which the item will be stored.
         item (Any): The item to be stored in the cache.
+        ttl (float): Seconds before the item expires, the default
+        TTL of the cache if None.
         """
         if key is None or item is None:
             return
-        
-        if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                mru_key, _ = self.cache_data.popitem(last=False)
-                print("DISCARD:", mru_key)
 
+        if self.expiry_heap:
+            self.expire()
+
+        size = self._item_size(item)
+        if self._too_large(size):
+            self._remove(key)
+            return
+
+        # Take an updated key out of the eviction candidates; it is
+        # stored again below
+        self.cache_data.pop(key, None)
+        while self._over_capacity(key, size):
+            mru_key, mru_item = self.cache_data.popitem(last=False)
+            self._discard(mru_key, mru_item)
 
         self.cache_data[key] = item
         self.cache_data.move_to_end(key, last=False)
+        self._stored(key, size)
+        self._expire_at(key, ttl)
 
     def get(self, key):
         """Retrieves an item from the cache by its key.
@@ -51,6 +66,8 @@ class MRUCache(BaseCaching):
         Returns:
         The value associated with the key, or None if the key does not exist.
         """
+        if self.expires and self._expired(key):
+            return None
         if key is not None and key in self.cache_data:
 
             self.cache_data.move_to_end(key, last=False)
@@ -1,18 +1,68 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import heapq
+import itertools
+import sys
+import time
+from cache_stats import CacheStats
+
+
+def print_discard(key, item):
+    """ Default eviction listener: print the discarded key
+    """
+    print("DISCARD: {}".format(key))
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the capacity of each cache, in items and optionally in bytes
+      - when items expire
+      - who hears about evictions, and optional statistics
     """
     MAX_ITEMS = 4
+    EXPIRE_BATCH = 16
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizeof=None,
+                 ttl=None, clock=None, listener=None, stats=False):
         """ Initiliaze
+
+        max_items bounds the number of items, MAX_ITEMS by default.
+        max_bytes, when given, also bounds the total size of the items,
+        each weighed once on put by sizeof (sys.getsizeof by default).
+        ttl is the default lifetime of the items in seconds, as measured
+        by clock (time.monotonic by default); None keeps them until they
+        are evicted.
+        listener(key, item) is called on every eviction, print_discard
+        by default. stats=True counts what happens to the cache in
+        self.stats, a CacheStats; otherwise self.stats is None and get
+        and put run uninstrumented.
         """
+        if max_items is None:
+            max_items = self.MAX_ITEMS
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
         self.cache_data = {}
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or sys.getsizeof
+        self.current_bytes = 0
+        self.item_bytes = {}
+        self.ttl = ttl
+        self.clock = clock or time.monotonic
+        self.expires = {}
+        self.expiry_heap = []
+        self.__sequence = itertools.count()
+        self.listener = listener or print_discard
+        self.stats = None
+        if stats:
+            self.stats = CacheStats(self.clock)
+            self.get = self.__counted_get
+            self.put = self.__counted_put
 
     def print_cache(self):
         """ Print the cache
@@ -21,8 +71,8 @@ class BaseCaching():
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache, for ttl seconds if given
         """
         raise NotImplementedError("put must be implemented in your cache class")
 
@@ -30,4 +80,134 @@ class BaseCaching():
         """ Get an item by key
         """
         raise NotImplementedError("get must be implemented in your cache class")
-    
\ No newline at end of file
+
+    def __counted_get(self, key):
+        """ get, counting hits and misses
+        """
+        item = type(self).get(self, key)
+        if item is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return item
+
+    def __counted_put(self, key, item, ttl=None):
+        """ put, counting inserts and updates
+        """
+        update = key in self.cache_data
+        type(self).put(self, key, item, ttl)
+        if key is not None and item is not None:
+            self.stats.stored(key, update, key in self.cache_data)
+
+    def expire(self, limit=None):
+        """ Look at up to limit deadlines (EXPIRE_BATCH by default),
+        soonest first, remove the items that expired and return how many
+        were removed
+        """
+        heap = self.expiry_heap
+        if not heap:
+            return 0
+        now = self.clock()
+        if limit is None:
+            limit = self.EXPIRE_BATCH
+        removed = 0
+        for _ in range(limit):
+            if not heap or heap[0][0] > now:
+                break
+            deadline, _, key = heapq.heappop(heap)
+            if self.expires.get(key) == deadline:
+                self._remove(key)
+                removed += 1
+        if removed and self.stats is not None:
+            self.stats.expirations += removed
+        return removed
+
+    def _expire_at(self, key, ttl):
+        """ Set the deadline of the item just stored under key, from its
+        own ttl or the default one
+        """
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is None:
+            if self.expires:
+                self.expires.pop(key, None)
+            return
+        deadline = self.clock() + ttl
+        self.expires[key] = deadline
+        heap = self.expiry_heap
+        heapq.heappush(heap, (deadline, next(self.__sequence), key))
+        if len(heap) > 2 * len(self.expires) + self.EXPIRE_BATCH:
+            # Updates left stale deadlines behind: rebuild the heap
+            # from the live ones.
+            self.expiry_heap = [
+                (deadline, next(self.__sequence), key)
+                for key, deadline in self.expires.items()
+            ]
+            heapq.heapify(self.expiry_heap)
+
+    def _expired(self, key):
+        """ Remove the item stored under key if it has expired
+        """
+        deadline = self.expires.get(key)
+        if deadline is None or deadline > self.clock():
+            return False
+        self._remove(key)
+        if self.stats is not None:
+            self.stats.expirations += 1
+        return True
+
+    def _item_size(self, item):
+        """ Weigh an item, 0 when the cache is not bounded in bytes
+        """
+        if self.max_bytes is None:
+            return 0
+        return self.sizeof(item)
+
+    def _too_large(self, size):
+        """ Whether an item of size bytes can never fit in the cache
+        """
+        return self.max_bytes is not None and size > self.max_bytes
+
+    def _over_capacity(self, key, size):
+        """ Whether storing an item of size bytes under key needs an
+        eviction first
+        """
+        if key not in self.cache_data and \
+                len(self.cache_data) >= self.max_items:
+            return True
+        if self.max_bytes is None:
+            return False
+        current = self.current_bytes - self.item_bytes.get(key, 0)
+        return current + size > self.max_bytes
+
+    def _stored(self, key, size):
+        """ Account for the item just stored under key
+        """
+        if self.max_bytes is not None:
+            self.current_bytes += size - self.item_bytes.get(key, 0)
+            self.item_bytes[key] = size
+
+    def _forget(self, key):
+        """ Stop accounting for the item stored under key
+        """
+        if self.max_bytes is not None:
+            self.current_bytes -= self.item_bytes.pop(key, 0)
+        if self.expires:
+            self.expires.pop(key, None)
+
+    def _discard(self, key, item):
+        """ Account for the eviction of key, already removed by the
+        policy, and notify the listener
+        """
+        if self.stats is not None:
+            self.stats.evicted(key)
+        self._forget(key)
+        self.listener(key, item)
+
+    def _remove(self, key):
+        """ Remove key from the cache, if present, without reporting it
+        """
+        if self.cache_data.pop(key, None) is not None:
+            self._forget(key)
+            if self.stats is not None:
+                self.stats.removed(key)
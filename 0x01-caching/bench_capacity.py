@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: eviction accuracy of memory-bounded caches.
+
+Every policy replays the same Zipf-like get/put workload over items of
+widely varying sizes twice: bounded by `max_bytes`, then by the number
+of items that fits the same budget on average. The table shows how full
+each cache keeps its byte budget, how far it ever goes over it, and
+whether the byte accounting ever drifts from the size of the items
+really held (drift, in bytes).
+
+Usage: ./bench_capacity.py [--ops N] [--budget BYTES] [--sample N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+
+POLICIES = [
+    ("FIFO", __import__('1-fifo_cache').FIFOCache),
+    ("LIFO", __import__('2-lifo_cache').LIFOCache),
+    ("LRU", __import__('3-lru_cache').LRUCache),
+    ("MRU", __import__('4-mru_cache').MRUCache),
+    ("LFU", __import__('100-lfu_cache').LFUCache),
+]
+
+
+def item_for(key: int) -> bytes:
+    """Builds the item of a key, from 64B to about 64KiB, mostly small.
+    """
+    rng = random.Random(key)
+    return bytes(int(64 * 1024 ** rng.random()))
+
+
+def replay(cache, keys: list, budget: int, sample: int) -> dict:
+    """Runs the workload and weighs the items held every `sample` puts.
+    """
+    hits = puts = samples = overruns = 0
+    fill = peak = drift = 0
+    for key in keys:
+        if cache.get(key) is not None:
+            hits += 1
+            continue
+        cache.put(key, item_for(key))
+        puts += 1
+        if puts % sample:
+            continue
+        held = sum(map(sys.getsizeof, cache.cache_data.values()))
+        samples += 1
+        fill += held
+        peak = max(peak, held)
+        if held > budget:
+            overruns += 1
+        if cache.max_bytes is not None:
+            drift = max(drift, abs(cache.current_bytes - held))
+    return {
+        "hit": hits / len(keys),
+        "fill": fill / samples / budget,
+        "peak": peak / budget,
+        "overruns": overruns / samples,
+        "drift": drift,
+    }
+
+
+def main() -> None:
+    """Prints one row per policy and capacity bound.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--budget", type=int, default=4 << 20)
+    parser.add_argument("--sample", type=int, default=16,
+                        help="weigh the cache every N puts")
+    args = parser.parse_args()
+    rng = random.Random(0)
+    keys = [int(5000 * rng.random() ** 2) for _ in range(args.ops)]
+    mean = sum(sys.getsizeof(item_for(key)) for key in range(5000)) / 5000
+    max_items = max(1, int(args.budget / mean))
+    print("budget={}B mean item={:.0f}B -> max_items={}".format(
+        args.budget, mean, max_items))
+    print("{:<5} {:<10} {:>6} {:>7} {:>7} {:>9} {:>7}".format(
+        "cache", "bound", "hit%", "fill%", "peak%", "overrun%", "drift"))
+    with open(os.devnull, "w") as devnull:
+        for name, cls in POLICIES:
+            for bound, cache in (
+                    ("max_bytes", cls(max_items=len(keys),
+                                      max_bytes=args.budget)),
+                    ("max_items", cls(max_items=max_items))):
+                with contextlib.redirect_stdout(devnull):
+                    stats = replay(cache, keys, args.budget,
+                                   args.sample)
+                print("{:<5} {:<10} {:6.1f} {:7.1f} {:7.1f} {:9.1f} "
+                      "{:>7}".format(
+                          name, bound, 100 * stats["hit"],
+                          100 * stats["fill"], 100 * stats["peak"],
+                          100 * stats["overruns"], stats["drift"]))
+
+
+if __name__ == "__main__":
+    main()
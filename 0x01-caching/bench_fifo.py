@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Soak benchmark: FIFOCache memory and latency under a hot-key overwrite
+workload. Memory held by the cache must stay constant however long the
+workload runs.
+
+Usage: ./bench_fifo.py [--rounds N] [--ops N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+
+
+def main() -> None:
+    """Overwrites a few hot keys, with occasional new keys, and reports
+    the size of the cache's containers after every round.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--ops", type=int, default=500_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    cache = FIFOCache()
+    sizes = []
+    with open(os.devnull, "w") as devnull:
+        for round_ in range(args.rounds):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                for i in range(args.ops):
+                    if rng.random() < 0.99:
+                        cache.put(rng.randrange(2), i)
+                    else:
+                        cache.put(rng.randrange(1000), i)
+            elapsed = time.perf_counter() - start
+            current = sum(sys.getsizeof(value)
+                          for value in vars(cache).values())
+            sizes.append(current)
+            print("round={:<3} ops={:<9} {:7.1f} ns/op entries={} "
+                  "cache={:6.1f}KiB".format(
+                      round_ + 1, (round_ + 1) * args.ops,
+                      elapsed * 1e9 / args.ops, len(cache.cache_data),
+                      current / 1024))
+    growth = sizes[-1] - sizes[0]
+    print("memory growth after round 1: {:+.1f}KiB".format(growth / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Differential check and benchmark for LFUCache.
+
+The check replays randomized get/put traces against LFUCache and against
+the original list-based implementation, and fails on the first
+difference in DISCARD order. The original keeps its keys in a list
+ordered by decreasing use count, but moving a key that was just used to
+the front when every key before it was used more often breaks that
+order (see the README). On the traces where the order holds, the
+outputs must be identical; on the others, LFUCache is compared with a
+reference model of the intended policy (evict the lowest count, then the
+least recently used key) instead.
+The benchmark reports ns/op as the capacity grows.
+
+Usage: ./bench_lfu.py [--traces N] [--ops N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from base_caching import BaseCaching
+
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class BaselineLFU(BaseCaching):
+    """The original LFUCache, with a capacity argument, used as the
+    oracle. Keys are kept in `keys_freq` as [key, count] pairs, the last
+    one evicted first.
+    """
+
+    def __init__(self, max_items=None):
+        super().__init__(max_items)
+        self.cache_data = OrderedDict()
+        self.keys_freq = []
+
+    def __reorder_items(self, mru_key):
+        max_positions = []
+        mru_freq = 0
+        mru_pos = 0
+        ins_pos = 0
+        for i, key_freq in enumerate(self.keys_freq):
+            if key_freq[0] == mru_key:
+                mru_freq = key_freq[1] + 1
+                mru_pos = i
+                break
+            elif len(max_positions) == 0:
+                max_positions.append(i)
+            elif key_freq[1] < self.keys_freq[max_positions[-1]][1]:
+                max_positions.append(i)
+        max_positions.reverse()
+        for pos in max_positions:
+            if self.keys_freq[pos][1] > mru_freq:
+                break
+            ins_pos = pos
+        self.keys_freq.pop(mru_pos)
+        self.keys_freq.insert(ins_pos, [mru_key, mru_freq])
+
+    def put(self, key, item):
+        if key is None or item is None:
+            return
+        if key not in self.cache_data:
+            if len(self.cache_data) + 1 > self.max_items:
+                lfu_key, _ = self.keys_freq[-1]
+                self.cache_data.pop(lfu_key)
+                self.keys_freq.pop()
+                print("DISCARD:", lfu_key)
+            self.cache_data[key] = item
+            ins_index = len(self.keys_freq)
+            for i, key_freq in enumerate(self.keys_freq):
+                if key_freq[1] == 0:
+                    ins_index = i
+                    break
+            self.keys_freq.insert(ins_index, [key, 0])
+        else:
+            self.cache_data[key] = item
+            self.__reorder_items(key)
+
+    def get(self, key):
+        if key is not None and key in self.cache_data:
+            self.__reorder_items(key)
+        return self.cache_data.get(key, None)
+
+    def ordered(self) -> bool:
+        """Whether keys_freq is still ordered by decreasing count.
+        """
+        counts = [count for _, count in self.keys_freq]
+        return all(a >= b for a, b in zip(counts, counts[1:]))
+
+
+class ReferenceLFU(BaseCaching):
+    """O(n) LFU model with LRU tie-breaking, the intended policy.
+    """
+
+    def __init__(self, max_items=None):
+        super().__init__(max_items)
+        self.meta = {}
+        self.tick = 0
+
+    def put(self, key, item):
+        if key is None or item is None:
+            return
+        self.tick += 1
+        if key in self.cache_data:
+            freq, _ = self.meta[key]
+            self.meta[key] = (freq + 1, self.tick)
+        else:
+            if len(self.cache_data) >= self.max_items:
+                victim = min(self.meta, key=self.meta.get)
+                del self.meta[victim]
+                del self.cache_data[victim]
+                print("DISCARD:", victim)
+            self.meta[key] = (0, self.tick)
+        self.cache_data[key] = item
+
+    def get(self, key):
+        if key is None or key not in self.cache_data:
+            return None
+        self.tick += 1
+        freq, _ = self.meta[key]
+        self.meta[key] = (freq + 1, self.tick)
+        return self.cache_data[key]
+
+
+def replay(cache: BaseCaching, trace: list) -> Tuple[str, bool]:
+    """Replays a trace.
+
+    Returns:
+        Tuple[str, bool]: Everything the cache printed, and whether its
+        `ordered()` invariant, if it has one, held after every operation.
+    """
+    ordered = getattr(cache, "ordered", lambda: True)
+    held = True
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        for is_put, key in trace:
+            if is_put:
+                cache.put(key, key)
+            else:
+                cache.get(key)
+            held = held and ordered()
+    return out.getvalue(), held
+
+
+def check(traces: int) -> None:
+    """Compares LFUCache with the original implementation on random
+    traces, and with the reference model where the original misorders.
+    """
+    exact = 0
+    for seed in range(traces):
+        rng = random.Random(seed)
+        size = rng.randint(1, 8)
+        keys = rng.randint(size + 1, 4 * size)
+        trace = [(rng.random() < 0.5, rng.randrange(keys))
+                 for _ in range(rng.randint(1, 200))]
+        actual, _ = replay(LFUCache(size), trace)
+        expected, held = replay(BaselineLFU(size), trace)
+        if held:
+            exact += 1
+            oracle = "original implementation"
+        else:
+            expected, _ = replay(ReferenceLFU(size), trace)
+            oracle = "reference model"
+        assert actual == expected, "trace {} differs from the {}: {}".format(
+            seed, oracle, trace)
+    print("OK: {} random traces match the original implementation, {} "
+          "where it misorders match the reference model".format(
+              exact, traces - exact))
+
+
+def bench(ops: int) -> None:
+    """Reports ns/op of a Zipf-like workload at growing capacities.
+    """
+    for capacity in (4, 400, 40_000, 1_000_000):
+        cache = LFUCache(max_items=capacity)
+        rng = random.Random(capacity)
+        keys = [int(capacity * 2 * rng.random() ** 3) for _ in range(ops)]
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                if cache.get(key) is None:
+                    cache.put(key, i)
+            elapsed = time.perf_counter() - start
+        print("capacity={:<8} {:8.1f} ns/op".format(
+            capacity, elapsed * 1e9 / ops))
+
+
+def main() -> None:
+    """Runs the differential check, then the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--traces", type=int, default=2000)
+    parser.add_argument("--ops", type=int, default=200_000)
+    args = parser.parse_args()
+    check(args.traces)
+    bench(args.ops)
+
+
+if __name__ == "__main__":
+    main()
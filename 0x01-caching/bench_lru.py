@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LRUCache per-operation latency as the capacity grows from 4 to
+1M entries. An O(1) cache shows a flat ns/op curve.
+
+Usage: ./bench_lru.py [--ops N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+def main() -> None:
+    """Runs a mixed get/put workload at every capacity.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=200_000)
+    args = parser.parse_args()
+    for capacity in (4, 40, 400, 4_000, 40_000, 400_000, 1_000_000):
+        cache = LRUCache(max_items=capacity)
+        rng = random.Random(capacity)
+        for key in range(capacity):
+            cache.put(key, key)
+        keys = [rng.randrange(capacity * 2) for _ in range(args.ops)]
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                if i & 1:
+                    cache.put(key, i)
+                else:
+                    cache.get(key)
+            elapsed = time.perf_counter() - start
+        print("capacity={:<8} {:8.1f} ns/op".format(
+            capacity, elapsed * 1e9 / args.ops))
+
+if __name__ == "__main__":
+    main()
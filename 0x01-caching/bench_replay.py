@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Trace-replay benchmark for every caching policy.
+
+Replays synthetic traces (zipf, uniform, loop, shift) and recorded ones
+(--trace-file, one key per line) against every BaseCaching subclass of
+the `N-*_cache.py` modules, as a get-or-put workload. It reports the hit
+ratio, ns/op (best of --repeat runs), the peak memory allocated while
+replaying and the number of evictions, as a table or as JSON.
+
+As a regression gate, save the results of the reference code with
+--save, then run again with --baseline: the exit status is 1 when a hit
+ratio dropped, or ns/op or peak memory grew, beyond the tolerances.
+Synthetic traces are seeded, so hit ratios are reproducible.
+
+Usage: ./bench_replay.py [--traces zipf,uniform,loop,shift]
+                         [--trace-file PATH]... [--policies NAME,...]
+                         [--ops N] [--keys N] [--capacity N] [--repeat N]
+                         [--json] [--save FILE] [--baseline FILE]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import cache_traces
+from base_caching import BaseCaching
+
+
+def policies() -> dict:
+    """Finds the caching policy classes, by class name, in file order.
+    """
+    found = {}
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = glob.glob(os.path.join(here, "[0-9]*-*_cache.py"))
+    for path in sorted(paths, key=lambda p: int(
+            os.path.basename(p).split("-")[0])):
+        name = os.path.basename(path)[:-3]
+        module = __import__(name)
+        for value in vars(module).values():
+            if isinstance(value, type) and issubclass(value, BaseCaching) \
+                    and value.__module__ == name:
+                found[value.__name__] = value
+    return found
+
+
+def synthetic(name: str, args) -> list:
+    """Builds one of the synthetic traces.
+    """
+    if name == "zipf":
+        return cache_traces.zipf(args.ops, args.keys)
+    if name == "uniform":
+        return cache_traces.uniform(args.ops, args.keys)
+    if name == "loop":
+        return cache_traces.loop(args.ops, args.capacity * 3 // 2)
+    if name == "shift":
+        return cache_traces.shifts(cache_traces.zipf(args.ops, args.keys),
+                                   args.keys)
+    raise ValueError("unknown trace: {}".format(name))
+
+
+def replay(policy, trace: list, capacity: int) -> dict:
+    """Replays a trace once, counting hits and evictions.
+    """
+    evictions = [0]
+
+    def count(key, item):
+        evictions[0] += 1
+
+    cache = policy(max_items=capacity, listener=count)
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return {"hits": hits, "seconds": elapsed, "evictions": evictions[0]}
+
+
+def peak_memory(policy, trace: list, capacity: int) -> int:
+    """Replays a trace once under tracemalloc and returns the peak
+    number of bytes allocated, the cache included.
+    """
+    tracemalloc.start()
+    try:
+        replay(policy, trace, capacity)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(policy, trace: list, capacity: int, repeat: int) -> dict:
+    """Collects every metric of one policy on one trace.
+    """
+    runs = [replay(policy, trace, capacity) for _ in range(repeat)]
+    best = min(run["seconds"] for run in runs)
+    return {
+        "hit_ratio": runs[0]["hits"] / len(trace),
+        "ns_per_op": best * 1e9 / len(trace),
+        "peak_bytes": peak_memory(policy, trace, capacity),
+        "evictions": runs[0]["evictions"],
+    }
+
+
+def regressions(results: dict, baseline: dict, args) -> list:
+    """Lists the metrics that got worse than the baseline beyond the
+    tolerances.
+    """
+    if baseline["config"] != results["config"]:
+        return ["baseline was run with another configuration: {}".format(
+            baseline["config"])]
+    before = {(r["trace"], r["policy"]): r for r in baseline["results"]}
+    found = []
+    for now in results["results"]:
+        then = before.get((now["trace"], now["policy"]))
+        if then is None:
+            continue
+        where = "{} on {}".format(now["policy"], now["trace"])
+        if now["hit_ratio"] < then["hit_ratio"] - args.max_hit_drop:
+            found.append("{}: hit ratio {:.4f} -> {:.4f}".format(
+                where, then["hit_ratio"], now["hit_ratio"]))
+        if now["ns_per_op"] > then["ns_per_op"] * (1 + args.max_slowdown):
+            found.append("{}: {:.0f} -> {:.0f} ns/op".format(
+                where, then["ns_per_op"], now["ns_per_op"]))
+        if now["peak_bytes"] > then["peak_bytes"] * (
+                1 + args.max_memory_growth):
+            found.append("{}: peak memory {} -> {} bytes".format(
+                where, then["peak_bytes"], now["peak_bytes"]))
+    return found
+
+
+def main() -> None:
+    """Runs the selected traces against the selected policies.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--traces", default="zipf,uniform,loop,shift")
+    parser.add_argument("--trace-file", action="append", default=[])
+    parser.add_argument("--policies", default="")
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--capacity", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--save")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-hit-drop", type=float, default=0.001,
+                        help="tolerated absolute hit ratio drop")
+    parser.add_argument("--max-slowdown", type=float, default=0.25,
+                        help="tolerated relative ns/op growth")
+    parser.add_argument("--max-memory-growth", type=float, default=0.10,
+                        help="tolerated relative peak memory growth")
+    args = parser.parse_args()
+
+    classes = policies()
+    if args.policies:
+        classes = {name: classes[name] for name in args.policies.split(",")}
+    traces = [(name, synthetic(name, args))
+              for name in args.traces.split(",") if name]
+    traces += [(os.path.basename(path), cache_traces.recorded(path))
+               for path in args.trace_file]
+    results = {
+        "config": {"ops": args.ops, "keys": args.keys,
+                   "capacity": args.capacity,
+                   "traces": [name for name, _ in traces]},
+        "results": [],
+    }
+    if not args.json:
+        print("{:<12} {:<14} {:>7} {:>9} {:>11} {:>10}".format(
+            "trace", "policy", "hit%", "ns/op", "peak KiB", "evictions"))
+    for trace_name, trace in traces:
+        for name, policy in classes.items():
+            row = dict(trace=trace_name, policy=name,
+                       **measure(policy, trace, args.capacity, args.repeat))
+            results["results"].append(row)
+            if not args.json:
+                print("{:<12} {:<14} {:7.2f} {:9.0f} {:11.1f} {:>10}".format(
+                    trace_name, name, 100 * row["hit_ratio"],
+                    row["ns_per_op"], row["peak_bytes"] / 1024,
+                    row["evictions"]))
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args)
+        for regression in found:
+            print("REGRESSION: {}".format(regression), file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of eviction reporting and statistics on an eviction-heavy
+LRU workload. Compares the default listener printing DISCARD (to
+/dev/null), a listener doing nothing, and the same with stats=True, then
+prints the collected statistics in the Prometheus text format.
+
+Usage: ./bench_stats.py [--ops N] [--capacity N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+def ignore(key, item):
+    """Eviction listener doing nothing.
+    """
+
+
+def main() -> None:
+    """Prints ns/op of every configuration.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--capacity", type=int, default=1_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    keys = [rng.randrange(args.capacity * 4) for _ in range(args.ops)]
+    configs = [
+        ("print listener", {}),
+        ("no-op listener", {"listener": ignore}),
+        ("no-op listener + stats", {"listener": ignore, "stats": True}),
+    ]
+    cache = None
+    for name, options in configs:
+        cache = LRUCache(max_items=args.capacity, **options)
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                if cache.get(key) is None:
+                    cache.put(key, i)
+            elapsed = time.perf_counter() - start
+        print("{:<24} {:8.1f} ns/op".format(name, elapsed * 1e9 / args.ops))
+    print()
+    print(cache.stats.prometheus("lru", len(cache.cache_data)), end="")
+
+
+if __name__ == "__main__":
+    main()
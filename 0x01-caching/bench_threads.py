@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: throughput of the thread-safe caches at 1, 4, 16 and 64
+threads, lock-striped ShardedCache against a LockedCache behind a single
+global lock. After every run the shards are checked to hold no more than
+the capacity.
+
+Usage: ./bench_threads.py [--policy NAME] [--ops N] [--shards N]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+
+from sharded_cache import LockedCache, ShardedCache
+
+POLICIES = {
+    "fifo": __import__('1-fifo_cache').FIFOCache,
+    "lifo": __import__('2-lifo_cache').LIFOCache,
+    "lru": __import__('3-lru_cache').LRUCache,
+    "mru": __import__('4-mru_cache').MRUCache,
+    "lfu": __import__('100-lfu_cache').LFUCache,
+}
+CAPACITY = 10_000
+
+
+def run(cache, threads: int, ops: int) -> float:
+    """Splits a Zipf-like get-or-put workload between threads and returns
+    the wall time it took.
+    """
+    rng = random.Random(threads)
+    per_thread = ops // threads
+    traces = [
+        [int(CAPACITY * 4 * rng.random() ** 3) for _ in range(per_thread)]
+        for _ in range(threads)
+    ]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(keys):
+        barrier.wait()
+        for key in keys:
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    workers = [threading.Thread(target=worker, args=(keys,))
+               for keys in traces]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Prints ops/sec of both wrappers at every thread count.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--policy", choices=sorted(POLICIES) + ["all"],
+                        default="all")
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, default=ShardedCache.SHARDS)
+    args = parser.parse_args()
+    names = sorted(POLICIES) if args.policy == "all" else [args.policy]
+    print("{:<5} {:>7} {:>14} {:>14} {:>8}".format(
+        "cache", "threads", "locked ops/s", "sharded ops/s", "speedup"))
+    with open(os.devnull, "w") as devnull:
+        for name in names:
+            policy = POLICIES[name]
+            for threads in (1, 4, 16, 64):
+                locked = LockedCache(policy, max_items=CAPACITY)
+                sharded = ShardedCache(policy, args.shards,
+                                       max_items=CAPACITY)
+                with contextlib.redirect_stdout(devnull):
+                    locked_time = run(locked, threads, args.ops)
+                    sharded_time = run(sharded, threads, args.ops)
+                assert len(locked) <= CAPACITY
+                assert len(sharded) <= CAPACITY
+                for cache, _ in sharded.shards:
+                    assert len(cache.cache_data) <= cache.max_items
+                print("{:<5} {:>7} {:>14,.0f} {:>14,.0f} {:>7.2f}x".format(
+                    name, threads, args.ops / locked_time,
+                    args.ops / sharded_time, locked_time / sharded_time))
+
+
+if __name__ == "__main__":
+    main()
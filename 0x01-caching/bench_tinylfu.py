@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hit ratio and ops/sec of TinyLFUCache against the other
+policies on a Zipfian trace, on the same trace interrupted by long
+scans of keys that are never used again, and on a Zipfian trace whose
+popular keys change every quarter.
+
+Usage: ./bench_tinylfu.py [--ops N] [--capacity N] [--keys N]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+from cache_traces import scans, shifts, zipf
+
+POLICIES = [
+    ("FIFO", __import__('1-fifo_cache').FIFOCache),
+    ("LIFO", __import__('2-lifo_cache').LIFOCache),
+    ("LRU", __import__('3-lru_cache').LRUCache),
+    ("MRU", __import__('4-mru_cache').MRUCache),
+    ("LFU", __import__('100-lfu_cache').LFUCache),
+    ("TinyLFU", __import__('101-tinylfu_cache').TinyLFUCache),
+    ("ARC", __import__('102-arc_cache').ARCCache),
+    ("2Q", __import__('103-twoq_cache').TwoQCache),
+]
+
+
+def replay(cache, trace: list):
+    """Runs a get-or-put workload, returns the hit ratio and ops/sec.
+    """
+    hits = 0
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                hits += 1
+        elapsed = time.perf_counter() - start
+    return hits / len(trace), len(trace) / elapsed
+
+
+def main() -> None:
+    """Prints one row per trace and policy.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--capacity", type=int, default=1_000)
+    parser.add_argument("--keys", type=int, default=100_000)
+    args = parser.parse_args()
+    trace = zipf(args.ops, args.keys)
+    traces = [
+        ("zipf", trace),
+        ("scan", scans(trace, args.capacity, 10 * args.capacity)),
+        ("shift", shifts(trace, args.keys)),
+    ]
+    print("{:<5} {:<8} {:>6} {:>10}".format("trace", "cache", "hit%",
+                                             "ops/s"))
+    for trace_name, keys in traces:
+        for name, policy in POLICIES:
+            hit, rate = replay(policy(max_items=args.capacity), keys)
+            print("{:<5} {:<8} {:6.1f} {:>10,.0f}".format(
+                trace_name, name, 100 * hit, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Soak benchmark: memory held by expired items. A stream of new keys with a
+short TTL is put into a cache large enough to never evict, with and
+without the incremental sweep done on every put. Lazy expiry on get
+alone never reclaims keys that are not read again; the sweep keeps the
+cache at about the number of keys alive at any time, with bounded work
+per put.
+
+Usage: ./bench_ttl.py [--rounds N] [--ops N] [--ttl TICKS]
+"""
+
+import argparse
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+def main() -> None:
+    """Reports the items and deadlines held after every round.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--ttl", type=int, default=1_000)
+    args = parser.parse_args()
+    for mode, batch in (("lazy", 0), ("sweep", LRUCache.EXPIRE_BATCH)):
+        now = [0]
+        cache = LRUCache(max_items=args.rounds * args.ops, ttl=args.ttl,
+                         clock=lambda: now[0])
+        cache.EXPIRE_BATCH = batch
+        key = 0
+        for round_ in range(args.rounds):
+            start = time.perf_counter()
+            for _ in range(args.ops):
+                now[0] += 1
+                cache.put(key, key)
+                if key % 10 == 0:
+                    cache.get(key - args.ttl)
+                key += 1
+            elapsed = time.perf_counter() - start
+            print("{:<5} round={} {:7.1f} ns/op items={:<8} deadlines={}"
+                  .format(mode, round_ + 1, elapsed * 1e9 / args.ops,
+                          len(cache.cache_data), len(cache.expiry_heap)))
+
+
+if __name__ == "__main__":
+    main()
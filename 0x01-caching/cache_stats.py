@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+""" Cache statistics
+"""
+from bisect import bisect_left
+
+
+class CacheStats():
+    """
+    CacheStats counts what happens to a cache: hits, misses, inserts,
+    updates, evictions and expirations, plus a histogram of how long the
+    evicted items had been cached.
+    """
+    COUNTERS = ("hits", "misses", "inserts", "updates", "evictions",
+                "expirations")
+    AGE_BUCKETS = (0.001, 0.01, 0.1, 1, 10, 60, 600, 3600)
+
+    def __init__(self, clock):
+        """
+        Start counting, timing ages with clock
+        """
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.age_counts = [0] * (len(self.AGE_BUCKETS) + 1)
+        self.age_sum = 0.0
+        self.born = {}
+
+    def stored(self, key, update, cached):
+        """
+        Count a put of key, an update if the key was already cached;
+        cached tells whether the key is cached after the put
+        """
+        if update:
+            self.updates += 1
+        else:
+            self.inserts += 1
+        if cached and key not in self.born:
+            self.born[key] = self.clock()
+
+    def evicted(self, key):
+        """
+        Count the eviction of key and record its age
+        """
+        self.evictions += 1
+        born = self.born.pop(key, None)
+        if born is not None:
+            age = self.clock() - born
+            self.age_counts[bisect_left(self.AGE_BUCKETS, age)] += 1
+            self.age_sum += age
+
+    def removed(self, key):
+        """
+        Stop tracking key, removed from the cache
+        """
+        self.born.pop(key, None)
+
+    def as_dict(self):
+        """
+        Return the counters, the hit ratio and the eviction age histogram
+        """
+        stats = {name: getattr(self, name) for name in self.COUNTERS}
+        lookups = self.hits + self.misses
+        stats["hit_ratio"] = self.hits / lookups if lookups else 0.0
+        buckets = {}
+        count = 0
+        for bound, bucket in zip(self.AGE_BUCKETS + ("+Inf",),
+                                 self.age_counts):
+            count += bucket
+            buckets[str(bound)] = count
+        stats["eviction_age_seconds"] = {
+            "buckets": buckets, "sum": self.age_sum, "count": count,
+        }
+        return stats
+
+    def prometheus(self, name="cache", items=None):
+        """
+        Return the statistics in the Prometheus text exposition format,
+        labelled with the name of the cache and with its number of items
+        if given
+        """
+        label = 'cache="{}"'.format(
+            name.replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+        lines = []
+        for counter in self.COUNTERS:
+            metric = "cache_{}_total".format(counter)
+            lines.append("# TYPE {} counter".format(metric))
+            lines.append("{}{{{}}} {}".format(
+                metric, label, getattr(self, counter)))
+        if items is not None:
+            lines.append("# TYPE cache_items gauge")
+            lines.append("cache_items{{{}}} {}".format(label, items))
+        metric = "cache_eviction_age_seconds"
+        lines.append("# TYPE {} histogram".format(metric))
+        histogram = self.as_dict()["eviction_age_seconds"]
+        for bound, count in histogram["buckets"].items():
+            lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                metric, label, bound, count))
+        lines.append("{}_sum{{{}}} {}".format(metric, label,
+                                              histogram["sum"]))
+        lines.append("{}_count{{{}}} {}".format(metric, label,
+                                                histogram["count"]))
+        return "\n".join(lines) + "\n"
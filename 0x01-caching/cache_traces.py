@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+""" Synthetic and recorded key traces to replay against the caches
+"""
+import itertools
+import random
+
+
+def zipf(ops, keys, alpha=0.9, seed=0):
+    """
+    Draw ops keys out of keys, key k with weight 1 / k ** alpha
+    """
+    weights = list(itertools.accumulate(
+        1 / (k + 1) ** alpha for k in range(keys)))
+    return random.Random(seed).choices(range(keys), cum_weights=weights,
+                                       k=ops)
+
+
+def uniform(ops, keys, seed=0):
+    """
+    Draw ops keys out of keys, all equally likely
+    """
+    rng = random.Random(seed)
+    return [rng.randrange(keys) for _ in range(ops)]
+
+
+def loop(ops, length):
+    """
+    Scan the same length keys in order, over and over
+    """
+    return [i % length for i in range(ops)]
+
+
+def scans(trace, capacity, every):
+    """
+    Insert a scan of 2 * capacity new keys every `every` keys of trace
+    """
+    scanned = []
+    fresh = -1
+    for i in range(0, len(trace), every):
+        scanned += trace[i:i + every]
+        scanned += range(fresh, fresh - 2 * capacity, -1)
+        fresh -= 2 * capacity
+    return scanned
+
+
+def shifts(trace, keys, phases=4):
+    """
+    Give trace, drawn out of keys, a new set of popular keys in every
+    phase
+    """
+    phase = -(-len(trace) // phases)
+    return [key + i // phase * keys for i, key in enumerate(trace)]
+
+
+def recorded(path):
+    """
+    Read a recorded trace, one key per line; keys made of digits are
+    read as integers
+    """
+    with open(path) as f:
+        return [int(line) if line.isdigit() else line
+                for line in (line.strip() for line in f) if line]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+""" Thread-safe wrappers around the caching policies
+"""
+import threading
+from base_caching import BaseCaching
+
+
+class LockedCache():
+    """
+    LockedCache makes any caching policy thread-safe by serializing
+    every operation behind one lock.
+    """
+
+    def __init__(self, policy, *args, **kwargs):
+        """
+        Create the wrapped cache, policy(*args, **kwargs)
+        """
+        self.cache = policy(*args, **kwargs)
+        self.lock = threading.Lock()
+
+    def put(self, key, item, ttl=None):
+        """
+        Cache a key-value pair, for ttl seconds if given
+        """
+        with self.lock:
+            self.cache.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the value linked to a given key, or None
+        """
+        with self.lock:
+            return self.cache.get(key)
+
+    def expire(self, limit=None):
+        """
+        Remove up to limit expired items, see BaseCaching.expire
+        """
+        with self.lock:
+            return self.cache.expire(limit)
+
+    def print_cache(self):
+        """
+        Print the cache
+        """
+        with self.lock:
+            self.cache.print_cache()
+
+    def __len__(self):
+        """
+        Number of cached items
+        """
+        return len(self.cache.cache_data)
+
+
+class ShardedCache():
+    """
+    ShardedCache makes any caching policy thread-safe by spreading the
+    keys over independent shards, each a cache of that policy behind its
+    own lock, so threads working on different keys rarely wait on each
+    other.
+
+    The capacity is split between the shards and each shard applies the
+    policy to its own keys only: an LRU shard evicts its least recently
+    used key, which is not always the least recently used key overall.
+    """
+    SHARDS = 16
+
+    def __init__(self, policy, shards=None, max_items=None, max_bytes=None,
+                 **kwargs):
+        """
+        Create the shards, splitting max_items (MAX_ITEMS by default)
+        and max_bytes between them. Other keyword arguments are passed
+        on to the policy.
+        """
+        if max_items is None:
+            max_items = BaseCaching.MAX_ITEMS
+        shards = min(shards or self.SHARDS, max_items)
+        if max_bytes is not None:
+            max_bytes //= shards
+        self.shards = [
+            (policy(max_items=max_items // shards + (i < max_items % shards),
+                    max_bytes=max_bytes, **kwargs),
+             threading.Lock())
+            for i in range(shards)
+        ]
+
+    def put(self, key, item, ttl=None):
+        """
+        Cache a key-value pair in the shard of the key, for ttl seconds
+        if given
+        """
+        cache, lock = self.shards[hash(key) % len(self.shards)]
+        with lock:
+            cache.put(key, item, ttl)
+
+    def get(self, key):
+        """
+        Return the value linked to a given key, or None
+        """
+        cache, lock = self.shards[hash(key) % len(self.shards)]
+        with lock:
+            return cache.get(key)
+
+    def expire(self, limit=None):
+        """
+        Remove up to limit expired items from every shard, one shard
+        locked at a time
+        """
+        removed = 0
+        for cache, lock in self.shards:
+            with lock:
+                removed += cache.expire(limit)
+        return removed
+
+    def print_cache(self):
+        """
+        Print the cache, all shards merged
+        """
+        items = {}
+        for cache, lock in self.shards:
+            with lock:
+                items.update(cache.cache_data)
+        print("Current cache:")
+        for key in sorted(items.keys()):
+            print("{}: {}".format(key, items.get(key)))
+
+    def __len__(self):
+        """
+        Number of cached items
+        """
+        return sum(len(cache.cache_data) for cache, _ in self.shards)
+
+
+class Sweeper(threading.Thread):
+    """
+    Sweeper removes expired items from a LockedCache or a ShardedCache
+    in the background, looking at no more than limit deadlines per
+    shard every interval seconds.
+    """
+
+    def __init__(self, cache, interval=1.0, limit=None):
+        """
+        Prepare the sweeper, start() runs it
+        """
+        super().__init__(daemon=True)
+        self.cache = cache
+        self.interval = interval
+        self.limit = limit
+        self.stopped = threading.Event()
+
+    def run(self):
+        """
+        Sweep until stopped
+        """
+        while not self.stopped.wait(self.interval):
+            self.cache.expire(self.limit)
+
+    def stop(self):
+        """
+        Stop sweeping and wait for the current tick to finish
+        """
+        self.stopped.set()
+        self.join()
@@ -5,6 +5,9 @@ import pytz
 from flask_babel import Babel
 from typing import Union, Dict
 from flask import Flask, render_template, request, g
+from user_store import (
+    EXAMPLE_USERS, CachedUserStore, SQLiteUserStore, parse_user_id,
+)
 
 
 class Config:
@@ -13,6 +16,9 @@ class Config:
     LANGUAGES = ["en", "fr"]  # Supported languages
     BABEL_DEFAULT_LOCALE = "en"  # Default locale (language)
     BABEL_DEFAULT_TIMEZONE = "UTC"  # Default timezone
+    USER_DATABASE = ":memory:"  # SQLite database of the users
+    USER_CACHE_SIZE = 1024  # Users kept in memory
+    USER_CACHE_TTL = 60  # Seconds before a user is fetched again
 
 
 app = Flask(__name__)
@@ -20,30 +26,27 @@ app.config.from_object(Config)
 app.url_map.strict_slashes = False
 babel = Babel(app)
 
-# Example users with different locales and timezones
-users = {
-    1: {"name": "Balou", "locale": "fr", "timezone": "Europe/Paris"},
-    2: {"name": "Beyonce", "locale": "en", "timezone": "US/Central"},
-    3: {"name": "Spock", "locale": "kg", "timezone": "Vulcan"},
-    4: {"name": "Teletubby", "locale": None, "timezone": "Europe/London"},
-}
+user_store = CachedUserStore(
+    SQLiteUserStore(app.config['USER_DATABASE'], EXAMPLE_USERS),
+    max_items=app.config['USER_CACHE_SIZE'],
+    ttl=app.config['USER_CACHE_TTL'],
+)
 
 
 def get_user() -> Union[Dict, None]:
     """Fetches a user based on the 'login_as' query parameter.
     """
-    login_id = request.args.get('login_as', '')
-    if login_id:
-        return users.get(int(login_id), None)
-    return None
+    if 'user' not in g:
+        user_id = parse_user_id(request.args.get('login_as', ''))
+        g.user = user_store.get(user_id) if user_id is not None else None
+    return g.user
 
 
 @app.before_request
 def before_request() -> None:
     """Executes some setup before processing each request.
     """
-    user = get_user()
-    g.user = user
+    get_user()
 
 
 @babel.localeselector
@@ -2,9 +2,16 @@
 """A Basic Flask app with internationalization support.
 """
 import pytz
-from typing import Union, Dict
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Union, Dict, Optional
 from flask_babel import Babel, format_datetime
-from flask import Flask, render_template, request, g
+from flask import Flask, Response, render_template, request, g
+from catalogs import CatalogDomain
+from response_cache import ResponseCache
+from user_store import (
+    EXAMPLE_USERS, CachedUserStore, SQLiteUserStore, parse_user_id,
+)
 
 
 class Config:
@@ -13,30 +20,44 @@ class Config:
     LANGUAGES = ["en", "fr"]  # Supported languages for the app
     BABEL_DEFAULT_LOCALE = "en"  # Default locale (language)
     BABEL_DEFAULT_TIMEZONE = "UTC"  # Default timezone
+    RESOLUTION_CACHE_SIZE = 1024  # Locale/timezone resolutions kept
+    USER_DATABASE = ":memory:"  # SQLite database of the users
+    USER_CACHE_SIZE = 1024  # Users kept in memory
+    USER_CACHE_TTL = 60  # Seconds before a user is fetched again
+    RESPONSE_CACHE_SIZE = 1024  # Rendered pages kept, 0 to disable
+    RESPONSE_CACHE_BUCKET = 1  # Seconds a rendered page is reused
+    ASGI_THREADS = 10  # Threads running the app when served with asgi.py
 
 
 app = Flask(__name__)
 app.config.from_object(Config)
 app.url_map.strict_slashes = False
 babel = Babel(app)
+# Load every catalog now into tables that templates probe directly
+catalogs = CatalogDomain(babel.translation_directories, Config.LANGUAGES)
+catalogs.install(app)
 
-# Example users with different locales and timezones
-users = {
-    1: {"name": "Balou", "locale": "fr", "timezone": "Europe/Paris"},
-    2: {"name": "Beyonce", "locale": "en", "timezone": "US/Central"},
-    3: {"name": "Spock", "locale": "kg", "timezone": "Vulcan"},
-    4: {"name": "Teletubby", "locale": None, "timezone": "Europe/London"},
-}
+user_store = CachedUserStore(
+    SQLiteUserStore(app.config['USER_DATABASE'], EXAMPLE_USERS),
+    max_items=app.config['USER_CACHE_SIZE'],
+    ttl=app.config['USER_CACHE_TTL'],
+)
+page_cache = ResponseCache(
+    max_items=app.config['RESPONSE_CACHE_SIZE'],
+    bucket=app.config['RESPONSE_CACHE_BUCKET'],
+)
 
 
 def get_user() -> Union[Dict, None]:
     """Fetches a user based on the 'login_as' query parameter.
-    If no user is found, returns None.
+    If no user is found, or the id is invalid, returns None.
+    The user is only fetched once per request, then kept in `g.user`.
     """
-    login_id = request.args.get('login_as', '')  # Get the user ID from query parameters
-    if login_id:
-        return users.get(int(login_id), None)
-    return None
+    if 'user' not in g:
+        # Get the user ID from query parameters
+        user_id = parse_user_id(request.args.get('login_as', ''))
+        g.user = user_store.get(user_id) if user_id is not None else None
+    return g.user
 
 
 @app.before_request
@@ -44,8 +65,32 @@ def before_request() -> None:
     """Executes before each request to set up the user context.
     Stores the user information globally (in `g.user`).
     """
-    user = get_user()
-    g.user = user
+    get_user()
+
+
+@lru_cache(maxsize=Config.RESOLUTION_CACHE_SIZE)
+def resolve_locale(query_locale: str, user_locale: Optional[str],
+                   header_locale: str) -> str:
+    """Picks the first supported locale out of the query string, user
+    settings and headers, or the default one.
+    Results are cached, so each combination is only resolved once.
+    """
+    for locale in (query_locale, user_locale, header_locale):
+        if locale in app.config["LANGUAGES"]:
+            return locale
+    return app.config['BABEL_DEFAULT_LOCALE']
+
+
+@lru_cache(maxsize=Config.RESOLUTION_CACHE_SIZE)
+def resolve_timezone(name: str) -> Optional[tzinfo]:
+    """Looks up a timezone by name, returning None for unknown names.
+    Unknown names are cached too, so an invalid zone such as "Vulcan"
+    does not make pytz search for it again on every request.
+    """
+    try:
+        return pytz.timezone(name)
+    except pytz.exceptions.UnknownTimeZoneError:
+        return None
 
 
 @babel.localeselector
@@ -53,50 +98,46 @@ def get_locale() -> str:
     """Determines the locale (language) for the current request.
     Checks the following sources in order: query string, user settings, headers.
     """
-    queries = request.query_string.decode('utf-8').split('&')  # Parse the query string
-    query_table = dict(map(
-        lambda x: (x if '=' in x else '{}='.format(x)).split('='),
-        queries,
-    ))  # Convert query string into a dictionary
-    locale = query_table.get('locale', '')  # Get 'locale' query parameter
-    if locale in app.config["LANGUAGES"]:
-        return locale  # If locale is valid, use it
-    
-    # Check the user's preferred locale if available
     user_details = getattr(g, 'user', None)
-    if user_details and user_details['locale'] in app.config["LANGUAGES"]:
-        return user_details['locale']
-    
-    # Check the 'locale' header for the language preference
-    header_locale = request.headers.get('locale', '')
-    if header_locale in app.config["LANGUAGES"]:
-        return header_locale
-
-    # Fallback to the default locale if no match is found
-    return app.config['BABEL_DEFAULT_LOCALE']
+    return resolve_locale(
+        request.args.get('locale', ''),  # 'locale' query parameter
+        user_details['locale'] if user_details else None,
+        request.headers.get('locale', ''),  # 'locale' header
+    )
 
 
 @babel.timezoneselector
-def get_timezone() -> str:
+def get_timezone() -> tzinfo:
     """Determines the timezone for the current request.
     Checks the following sources in order: query string, user settings.
     """
     timezone = request.args.get('timezone', '').strip()  # Get the 'timezone' from query parameters
     if not timezone and g.user:
         timezone = g.user['timezone']  # Use the user's timezone if no query parameter is found
-    try:
-        return pytz.timezone(timezone).zone  # Try to return a valid timezone
-    except pytz.exceptions.UnknownTimeZoneError:
-        return app.config['BABEL_DEFAULT_TIMEZONE']  # Fallback to default timezone if invalid timezone
+    tz = resolve_timezone(timezone)
+    if tz is None:  # Fallback to default timezone if invalid timezone
+        tz = resolve_timezone(app.config['BABEL_DEFAULT_TIMEZONE'])
+    return tz
 
 
 @app.route('/')
-def get_index() -> str:
+def get_index() -> Response:
     """Renders the home page with current time in the selected timezone.
+    The page only depends on the locale, the timezone, the user and the
+    time, so it is rendered once per RESPONSE_CACHE_BUCKET seconds.
     """
-    g.time = format_datetime()  # Format current time based on the selected timezone
-    return render_template('index.html')  # Render the homepage template
+    user_id = parse_user_id(request.args.get('login_as', ''))
+    key = (get_locale(), get_timezone().zone, user_id if g.user else None)
+
+    def render(start: float) -> str:
+        # Format the start of the bucket based on the selected timezone
+        g.time = format_datetime(datetime.fromtimestamp(start, pytz.utc))
+        return render_template('index.html')  # Render the homepage template
+
+    return page_cache.respond(key, render)
 
 
 if __name__ == '__main__':
+    import gc
+    gc.freeze()  # Keep the preloaded catalogs out of the collector
     app.run(host='0.0.0.0', port=5000)  # Run the app on all available IPs at port 5000
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""ASGI entry point of the i18n Flask app.
+
+Serve it with an ASGI server, e.g. `uvicorn asgi:application`.
+"""
+import gc
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+
+from app import app, user_store
+from user_store import parse_user_id
+
+# The Flask app runs in a pool of threads, off the event loop
+flask_app = WSGIMiddleware(app, workers=app.config['ASGI_THREADS'])
+
+# Keep everything loaded so far, the catalogs included, out of the
+# garbage collector, so that workers forked from this process keep
+# sharing its memory pages
+gc.freeze()
+
+
+async def before_request(scope: dict) -> None:
+    """Loads the user of the request into the user cache, awaiting the
+    store on a miss rather than blocking, so that the app then finds the
+    user in memory.
+    """
+    query = parse_qsl(scope['query_string'].decode('latin-1'))
+    login_id = next((value for name, value in query if name == 'login_as'),
+                    '')  # First 'login_as' query parameter, as Flask reads
+    user_id = parse_user_id(login_id)
+    if user_id is not None:
+        await user_store.prefetch_async([user_id])
+
+
+async def application(scope: dict, receive, send) -> None:
+    """Handles a connection: resolves the user of HTTP requests, then
+    passes them on to the Flask app.
+    """
+    if scope['type'] == 'http':
+        await before_request(scope)
+    await flask_app(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(application, host='0.0.0.0', port=5000)
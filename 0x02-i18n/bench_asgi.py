@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Load test: throughput and latency of app.py served by the threaded
+Werkzeug server of app.run (WSGI) and by uvicorn with asgi.py (ASGI).
+Starts each server on a local port, then sends --requests requests over
+--concurrency connections at a time, one request per connection, mixing
+every user, no user, both locales and a few timezones.
+The client shares the machine with the server: compare the two runs
+with each other rather than with production numbers.
+
+Usage: ./bench_asgi.py [--requests N] [--concurrency N] [--port N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+QUERIES = (
+    "/",
+    "/?login_as=1",
+    "/?login_as=2",
+    "/?login_as=3",
+    "/?login_as=4",
+    "/?login_as=5",
+    "/?locale=fr",
+    "/?locale=fr&login_as=2",
+    "/?timezone=Europe/Paris",
+    "/?timezone=Vulcan",
+)
+
+SERVERS = (
+    ("wsgi", "from app import app; app.run(port={port}, threaded=True)"),
+    ("asgi", "import uvicorn; uvicorn.run('asgi:application', port={port},"
+             " log_level='warning', access_log=False)"),
+)
+
+
+def start(code: str, port: int) -> subprocess.Popen:
+    """Starts a server and waits until it accepts connections.
+    """
+    server = subprocess.Popen(
+        [sys.executable, "-c", code.format(port=port)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start: {}".format(code))
+
+
+async def fetch(port: int, query: str) -> float:
+    """Sends one request and returns its latency in seconds.
+    """
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("GET {} HTTP/1.1\r\nHost: localhost\r\n"
+                 "Connection: close\r\n\r\n".format(query).encode())
+    response = await reader.read()
+    writer.close()
+    if not response.startswith((b"HTTP/1.1 200", b"HTTP/1.0 200")):
+        raise RuntimeError("{}: {}".format(query, response[:40]))
+    return time.perf_counter() - start
+
+
+async def load(port: int, requests: int, concurrency: int) -> tuple:
+    """Sends the requests and returns the elapsed seconds and latencies.
+    """
+    queries = iter(itertools.islice(itertools.cycle(QUERIES), requests))
+    latencies = []
+
+    async def client() -> None:
+        for query in queries:
+            latencies.append(await fetch(port, query))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main() -> None:
+    """Prints the requests/sec and latency percentiles of every server.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=5100)
+    args = parser.parse_args()
+    for name, code in SERVERS:
+        server = start(code, args.port)
+        try:
+            asyncio.run(load(args.port, len(QUERIES), 1))  # warm up
+            elapsed, latencies = asyncio.run(
+                load(args.port, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print("{}  {:7.0f} requests/sec  p50 {:6.1f} ms  p99 {:6.1f} ms"
+              .format(name, args.requests / elapsed,
+                      statistics.median(latencies) * 1e3,
+                      latencies[len(latencies) * 99 // 100] * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: render time of templates/index.html, with --strings more
+translated strings, in en and fr. Generates the template and catalogs
+translating all its strings, then renders it once per request with
+flask_babel's default domain and with a preloaded CatalogDomain. Both
+load each catalog only once; what differs is the cost of each
+translated string. The default one goes through the jinja2.ext.i18n
+alias and wrapper, then flask_babel's get_domain(), get_translations()
+and get_locale() before its cached catalog is probed. The preloaded one
+is a template global doing a dict probe.
+
+Usage: ./bench_catalogs.py [--strings N] [--requests N] [--repeat N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+from flask import Flask, g, render_template, request
+from flask_babel import Babel
+
+from catalogs import CatalogDomain
+
+LOCALES = ("en", "fr")
+MESSAGES = ("home_title", "home_header", "logged_in_as", "not_logged_in",
+            "current_time_is")
+
+
+def write_files(directory: str, strings: int) -> None:
+    """Writes index.html with strings more messages, and the catalogs
+    translating every message of it.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(here, "templates", "index.html")) as f:
+        template = f.read()
+    extra = "".join("    <p>{{{{ _('message_{}') }}}}</p>\n".format(i)
+                    for i in range(strings))
+    os.mkdir(os.path.join(directory, "templates"))
+    with open(os.path.join(directory, "templates", "index.html"), "w") as f:
+        f.write(template.replace("</body>", extra + "</body>"))
+    ids = list(MESSAGES) + ["message_{}".format(i) for i in range(strings)]
+    for locale in LOCALES:
+        catalog = Catalog(locale=locale)
+        for msgid in ids:
+            catalog.add(msgid, "{} {}".format(locale, msgid))
+        path = os.path.join(directory, "translations", locale, "LC_MESSAGES")
+        os.makedirs(path)
+        with open(os.path.join(path, "messages.mo"), "wb") as f:
+            write_mo(f, catalog)
+
+
+def make_app(directory: str, preload: bool) -> Flask:
+    """Creates an app rendering the generated files, in the locale of the
+    'locale' query parameter.
+    """
+    app = Flask(__name__, template_folder=os.path.join(directory,
+                                                       "templates"))
+    app.config["BABEL_TRANSLATION_DIRECTORIES"] = os.path.join(
+        directory, "translations")
+    babel = Babel(app)
+    babel.localeselector(lambda: request.args.get("locale"))
+    if preload:
+        CatalogDomain(babel.translation_directories, LOCALES).install(app)
+    return app
+
+
+def render(app: Flask, locale: str, requests: int) -> tuple:
+    """Renders index.html in requests requests, and returns the
+    microseconds per render and the last page.
+    """
+    elapsed = 0.0
+    for _ in range(requests):
+        with app.test_request_context("/?locale={}".format(locale)):
+            app.preprocess_request()
+            g.user = None
+            g.time = "now"
+            start = time.perf_counter()
+            page = render_template("index.html")
+            elapsed += time.perf_counter() - start
+    return elapsed * 1e6 / requests, page
+
+
+def main() -> None:
+    """Prints the render time of every locale with and without the
+    preloaded catalogs.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strings", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory, args.strings)
+        pages = {}
+        for name, preload in (("flask_babel", False), ("preloaded", True)):
+            app = make_app(directory, preload)
+            for locale in LOCALES:
+                runs = [render(app, locale, args.requests)
+                        for _ in range(args.repeat)]
+                spent = min(run[0] for run in runs)
+                pages.setdefault(locale, set()).add(runs[0][1])
+                print("{:<12} {} {:8.1f} us/render".format(name, locale,
+                                                          spent))
+        for locale, rendered in pages.items():
+            if len(rendered) != 1:
+                print("MISMATCH: {} pages differ".format(locale))
+
+
+if __name__ == "__main__":
+    main()
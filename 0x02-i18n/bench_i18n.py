@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests/sec of the `/` route of app.py with the locale and
+timezone resolutions cached, and with the caches bypassed (every request
+resolves again, as before they were added), plus the time spent in the
+two selectors alone, which the rendering otherwise hides. Requests mix
+every user, no user, valid timezones and invalid ones such as "Vulcan".
+
+Usage: ./bench_i18n.py [--requests N] [--repeat N]
+"""
+
+import argparse
+import itertools
+import time
+
+app_module = __import__('app')
+
+QUERIES = (
+    "/",
+    "/?login_as=1",
+    "/?login_as=2",
+    "/?login_as=3",
+    "/?login_as=4",
+    "/?locale=fr",
+    "/?locale=fr&login_as=2",
+    "/?timezone=Europe/Paris",
+    "/?timezone=Vulcan",
+    "/?timezone=Mars/Olympus&login_as=1",
+)
+
+
+def run(client, requests: int) -> float:
+    """Sends requests to the app and returns the requests/sec.
+    """
+    queries = itertools.islice(itertools.cycle(QUERIES), requests)
+    start = time.perf_counter()
+    for query in queries:
+        client.get(query)
+    return requests / (time.perf_counter() - start)
+
+
+def selectors(requests: int) -> float:
+    """Runs before_request and both selectors for requests, and returns
+    the microseconds spent per request.
+    """
+    app = app_module.app
+    contexts = [app.test_request_context(query) for query in QUERIES]
+    elapsed = 0.0
+    for context in itertools.islice(itertools.cycle(contexts), requests):
+        with context:
+            start = time.perf_counter()
+            app_module.before_request()
+            app_module.get_locale()
+            app_module.get_timezone()
+            elapsed += time.perf_counter() - start
+    return elapsed * 1e6 / requests
+
+
+def main() -> None:
+    """Prints the requests/sec with and without the resolution caches.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    client = app_module.app.test_client()
+    cached = (app_module.resolve_locale, app_module.resolve_timezone)
+    modes = (("uncached", tuple(f.__wrapped__ for f in cached)),
+             ("cached", cached))
+    for name, (resolve_locale, resolve_timezone) in modes:
+        app_module.resolve_locale = resolve_locale
+        app_module.resolve_timezone = resolve_timezone
+        run(client, len(QUERIES))  # warm up
+        best = max(run(client, args.requests) for _ in range(args.repeat))
+        spent = min(selectors(args.requests) for _ in range(args.repeat))
+        print("{:<9} {:8.0f} requests/sec {:6.1f} us/request in selectors"
+              .format(name, best, spent))
+    print(app_module.resolve_timezone.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests/sec of the `/` route of app.py rendering every page,
+serving pages from the response cache, and answering revalidations
+(If-None-Match) of cached pages with 304 Not Modified. Requests mix every
+user, no user, both locales and a few timezones.
+
+Usage: ./bench_responses.py [--requests N] [--repeat N]
+"""
+
+import argparse
+import itertools
+import time
+
+app_module = __import__('app')
+
+QUERIES = (
+    "/",
+    "/?login_as=1",
+    "/?login_as=2",
+    "/?login_as=3",
+    "/?login_as=4",
+    "/?locale=fr",
+    "/?locale=fr&login_as=2",
+    "/?timezone=Europe/Paris",
+    "/?timezone=Vulcan",
+)
+
+
+def run(client, requests: int, etags: dict = None) -> float:
+    """Sends requests to the app, with the ETags of etags if given, and
+    returns the requests/sec.
+    """
+    queries = itertools.islice(itertools.cycle(QUERIES), requests)
+    start = time.perf_counter()
+    for query in queries:
+        if etags is None:
+            client.get(query)
+        else:
+            client.get(query, headers={"If-None-Match": etags[query]})
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Prints the requests/sec of every mode.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    client = app_module.app.test_client()
+    cache = app_module.page_cache
+    size = cache.max_items
+    # Stop the clock of the cache, so that its time bucket, the pages and
+    # their ETags stay the same all along
+    now = time.time()
+    cache.clock = lambda: now
+    etags = {query: client.get(query).headers["ETag"] for query in QUERIES}
+    modes = (("rendered", 0, None), ("cached", size, None),
+             ("revalidated", size, etags))
+    for name, max_items, sent in modes:
+        cache.max_items = max_items
+        cache.clear()
+        run(client, len(QUERIES))  # warm up
+        best = max(run(client, args.requests, sent)
+                   for _ in range(args.repeat))
+        print("{:<12} {:8.0f} requests/sec".format(name, best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency of the before_request hook of app.py, which loads the
+user of `login_as`, against a SQLite user store of --users users:
+straight from SQLite, through a cold CachedUserStore (emptied before
+every request, so each one is a miss and a query), and through a warm
+one filled beforehand with a single batched prefetch.
+
+Usage: ./bench_users.py [--users N] [--requests N] [--database PATH]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from user_store import CachedUserStore, SQLiteUserStore
+
+app_module = __import__('app')
+
+
+def latencies(store, contexts: list, before=None) -> list:
+    """Runs before_request in every request context with store as the
+    user store, and returns the microseconds each run took.
+    """
+    app_module.user_store = store
+    spent = []
+    for context in contexts:
+        if before is not None:
+            before()
+        with context:
+            start = time.perf_counter()
+            app_module.before_request()
+            spent.append((time.perf_counter() - start) * 1e6)
+    return spent
+
+
+def main() -> None:
+    """Prints the median and p99 latency of every configuration.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--database",
+                        help="SQLite file, a temporary one by default")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or os.path.join(tmp, "users.db")
+        sqlite = SQLiteUserStore(path, {
+            user_id: {"name": "user{}".format(user_id), "locale": "fr",
+                      "timezone": "Europe/Paris"}
+            for user_id in range(1, args.users + 1)})
+        rng = random.Random(0)
+        # one request in ten has an unknown user
+        ids = [rng.randrange(1, args.users * 11 // 10 + 1)
+               for _ in range(args.requests)]
+        contexts = [app_module.app.test_request_context(
+            "/?login_as={}".format(user_id)) for user_id in ids]
+        cold = CachedUserStore(sqlite, max_items=args.users * 2)
+        warm = CachedUserStore(sqlite, max_items=args.users * 2)
+        warm.prefetch(range(1, args.users * 11 // 10 + 1))
+        configs = (("sqlite", sqlite, None), ("cold cache", cold, cold.clear),
+                   ("warm cache", warm, None))
+        for name, store, before in configs:
+            spent = sorted(latencies(store, contexts, before))
+            print("{:<11} median {:6.1f} us  p99 {:6.1f} us".format(
+                name, statistics.median(spent),
+                spent[len(spent) * 99 // 100]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Message catalogs loaded once per process.
+"""
+import os
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Union
+
+from babel import support
+from babel.messages.mofile import read_mo
+from flask import Flask
+from jinja2.nodes import EvalContext
+from jinja2.utils import pass_eval_context
+from markupsafe import Markup
+from flask_babel import Domain, get_locale
+
+EMPTY = MappingProxyType({})
+
+
+def default_plural(num: int) -> int:
+    """Returns the plural form of num in catalogs without plural forms:
+    the first one for 1, the second one otherwise.
+    """
+    return int(num != 1)
+
+
+def read_table(path: str) -> dict:
+    """Reads the translated messages of a compiled catalog.
+
+    Args:
+        path (str): The path of the .mo file.
+
+    Returns:
+        dict: The translations by message id, (id, plural form) for
+        plural messages, with ids in a context prefixed by the context
+        and "\\x04" as in gettext. Untranslated messages are left out.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        catalog = read_mo(f)
+    table = {}
+    for message in catalog:
+        if not message.id:
+            continue  # The header
+        prefix = message.context + '\x04' if message.context else ''
+        if isinstance(message.id, tuple):
+            for form, string in enumerate(message.string):
+                if string:
+                    table[prefix + message.id[0], form] = string
+        elif message.string:
+            table[prefix + message.id] = message.string
+    return table
+
+
+class CatalogDomain(Domain):
+    """Translation domain whose catalogs are all loaded at startup into
+    read-only message tables, shared by every request and thread, so a
+    translation is a single dict probe.
+    Load it before the server forks its workers and they share the
+    tables too.
+    """
+
+    def __init__(self, translation_directories: Union[str, Iterable[str]],
+                 locales: Iterable[str], domain: str = 'messages') -> None:
+        """Loads the catalogs of every locale.
+
+        Args:
+            translation_directories (Union[str, Iterable[str]]): The
+                directories holding the catalogs, later ones overriding
+                earlier ones.
+            locales (Iterable[str]): The locales to load.
+            domain (str): The name of the catalogs.
+        """
+        if isinstance(translation_directories, str):
+            translation_directories = [translation_directories]
+        translation_directories = list(translation_directories)
+        super().__init__(translation_directories, domain)
+        tables = {}
+        translations = {}
+        plurals = {}
+        for locale in locales:
+            table = {}
+            merged = support.Translations()
+            merged.plural = default_plural
+            for dirname in translation_directories:
+                table.update(read_table(os.path.join(
+                    dirname, locale, 'LC_MESSAGES', domain + '.mo')))
+                catalog = support.Translations.load(dirname, [locale], domain)
+                merged.merge(catalog)
+                if hasattr(catalog, 'plural'):
+                    merged.plural = catalog.plural
+            tables[locale] = MappingProxyType(table)
+            translations[locale] = merged
+            plurals[locale] = merged.plural
+        self.tables = MappingProxyType(tables)
+        self.translations = MappingProxyType(translations)
+        self.plurals = MappingProxyType(plurals)
+        self.__last = (None, EMPTY)  # Locale of the last lookup, its table
+
+    def table(self) -> Mapping:
+        """Returns the message table of the current locale.
+        flask_babel keeps the same locale object for a whole request, so
+        the table is only looked up again when the locale changes.
+        """
+        locale = get_locale()
+        last = self.__last
+        if last[0] is locale:
+            return last[1]
+        table = self.tables.get(str(locale), EMPTY)
+        self.__last = (locale, table)
+        return table
+
+    def plural(self) -> Callable[[int], int]:
+        """Returns the plural form function of the current locale.
+        """
+        return self.plurals.get(str(get_locale()), default_plural)
+
+    def get_translations(self) -> support.NullTranslations:
+        """Returns the preloaded translations of the current locale.
+        """
+        return self.translations.get(str(get_locale()),
+                                     support.NullTranslations())
+
+    def lookup(self, string: str) -> str:
+        """Translates string, without formatting.
+        """
+        return self.table().get(string, string)
+
+    def lookup_plural(self, singular: str, plural: str, num: int) -> str:
+        """Translates the form of a message matching num, without
+        formatting.
+        """
+        return self.__lookup_plural(singular, singular, plural, num)
+
+    def gettext(self, string: str, **variables) -> str:
+        """Translates string and formats it with variables.
+        """
+        s = self.table().get(string, string)
+        return s if not variables else s % variables
+
+    def ngettext(self, singular: str, plural: str, num: int,
+                 **variables) -> str:
+        """Translates the form of a message matching num and formats it
+        with variables, num included.
+        """
+        variables.setdefault('num', num)
+        s = self.lookup_plural(singular, plural, num)
+        return s if not variables else s % variables
+
+    def pgettext(self, context: str, string: str, **variables) -> str:
+        """Like gettext, with a context.
+        """
+        s = self.table().get(context + '\x04' + string, string)
+        return s if not variables else s % variables
+
+    def npgettext(self, context: str, singular: str, plural: str, num: int,
+                  **variables) -> str:
+        """Like ngettext, with a context.
+        """
+        variables.setdefault('num', num)
+        s = self.__lookup_plural(context + '\x04' + singular, singular,
+                                 plural, num)
+        return s if not variables else s % variables
+
+    def __lookup_plural(self, key: str, singular: str, plural: str,
+                        num: int) -> str:
+        """Looks the form of the message key matching num up, falling back
+        to singular or plural.
+        """
+        default = singular if num == 1 else plural
+        return self.table().get((key, self.plural()(num)), default)
+
+    def install(self, app: Flask) -> None:
+        """Makes this domain the one of every request and template of app.
+        Templates call it directly rather than through the wrappers of
+        jinja2.ext.i18n, with the same results: translations are
+        escaped like the template, then always formatted.
+
+        Args:
+            app (Flask): The application, set up with flask_babel.
+        """
+        app.before_request(self.as_default)
+        app.jinja_env.install_gettext_callables(
+            self.lookup, self.lookup_plural, newstyle=True)
+
+        @pass_eval_context
+        def gettext(eval_ctx: EvalContext, string: str, **variables) -> str:
+            """Translates string in a template."""
+            s = self.table().get(string, string)
+            if eval_ctx.autoescape:
+                s = Markup(s)
+            return s % variables
+
+        @pass_eval_context
+        def ngettext(eval_ctx: EvalContext, singular: str, plural: str,
+                     num: int, **variables) -> str:
+            """Translates the form of a message matching num in a
+            template."""
+            variables.setdefault('num', num)
+            s = self.lookup_plural(singular, plural, num)
+            if eval_ctx.autoescape:
+                s = Markup(s)
+            return s % variables
+
+        app.jinja_env.globals.update(_=gettext, gettext=gettext,
+                                     ngettext=ngettext)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Cache of rendered pages for the i18n Flask apps.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from flask import Response, make_response, request
+
+
+class ResponseCache:
+    """Keeps the last rendered pages, by key, for as long as the clock
+    stays in the same time bucket, and serves them with an ETag, so
+    clients holding the same page get a 304 Not Modified.
+    """
+
+    def __init__(self, max_items: int = 1024, bucket: float = 1,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Creates an empty cache.
+
+        Args:
+            max_items (int): The number of pages kept, least recently
+                used first out; 0 disables the cache.
+            bucket (float): The seconds pages are kept: every page
+                rendered in the same bucket is rendered for its start.
+            clock (Callable[[], float]): The time source, in seconds
+                since the epoch.
+        """
+        self.max_items = max_items
+        self.bucket = bucket
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__pages = OrderedDict()  # key -> (page, etag)
+        self.__bucket = None  # Bucket of the cached pages
+
+    def respond(self, key: Hashable,
+                render: Callable[[float], str]) -> Response:
+        """Responds to the current request with the page of key,
+        rendering it only if it is not cached.
+
+        Args:
+            key (Hashable): Everything the page depends on, besides time.
+            render (Callable[[float], str]): Renders the page for the
+                start of the current bucket, in seconds since the epoch.
+
+        Returns:
+            Response: The page, or 304 Not Modified if the request
+            already has it.
+        """
+        bucket = int(self.clock() // self.bucket)
+        with self.__lock:
+            if bucket != self.__bucket:
+                self.__pages.clear()  # Pages of past buckets are stale
+                self.__bucket = bucket
+            entry = self.__pages.get(key)
+            if entry is not None:
+                self.__pages.move_to_end(key)
+        if entry is None:
+            entry = self.__keep(bucket, key, render(bucket * self.bucket))
+        response = make_response(entry[0])
+        response.set_etag(entry[1])
+        return response.make_conditional(request)
+
+    def clear(self) -> None:
+        """Forgets every cached page.
+        """
+        with self.__lock:
+            self.__pages.clear()
+
+    def __len__(self) -> int:
+        """Returns the number of cached pages.
+        """
+        return len(self.__pages)
+
+    def __keep(self, bucket: int, key: Hashable,
+               page: str) -> Tuple[str, str]:
+        """Caches a page rendered in bucket, unless the bucket is over.
+        """
+        entry = (page, hashlib.sha1(page.encode()).hexdigest())
+        with self.__lock:
+            if bucket == self.__bucket and self.max_items > 0:
+                self.__pages[key] = entry
+                self.__pages.move_to_end(key)
+                while len(self.__pages) > self.max_items:
+                    self.__pages.popitem(last=False)
+        return entry
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""User stores for the i18n Flask apps.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Example users with different locales and timezones
+EXAMPLE_USERS = {
+    1: {"name": "Balou", "locale": "fr", "timezone": "Europe/Paris"},
+    2: {"name": "Beyonce", "locale": "en", "timezone": "US/Central"},
+    3: {"name": "Spock", "locale": "kg", "timezone": "Vulcan"},
+    4: {"name": "Teletubby", "locale": None, "timezone": "Europe/London"},
+}
+
+MAX_USER_ID = 2 ** 63 - 1  # Largest SQLite integer
+MAX_USER_ID_DIGITS = len(str(MAX_USER_ID))
+
+
+def parse_user_id(value: str) -> Optional[int]:
+    """Parses a user id such as the 'login_as' query parameter.
+
+    Args:
+        value (str): The raw value.
+
+    Returns:
+        Optional[int]: The id, or None if the value is not a plain
+        decimal number between 1 and MAX_USER_ID.
+    """
+    value = value.strip()
+    # Longer values cannot be ids, and are not worth converting
+    if len(value) > MAX_USER_ID_DIGITS:
+        return None
+    if value.isascii() and value.isdigit():
+        user_id = int(value)
+        if 1 <= user_id <= MAX_USER_ID:
+            return user_id
+    return None
+
+
+class UserStore:
+    """Interface of the user stores.
+    """
+
+    def get(self, user_id: int) -> Optional[Dict]:
+        """Fetches one user.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Optional[Dict]: The user, or None if there is no such user.
+        """
+        return self.get_many([user_id]).get(user_id)
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Fetches several users at once.
+
+        Args:
+            user_ids (Iterable[int]): The ids of the users.
+
+        Returns:
+            Dict[int, Dict]: The users found, by id.
+        """
+        raise NotImplementedError("get_many must be implemented in your store")
+
+    async def get_many_async(self, user_ids: Iterable[int]
+                             ) -> Dict[int, Dict]:
+        """Fetches several users at once without blocking the event loop,
+        by running get_many in the loop's default executor.
+        Stores with an asyncio driver can override it.
+
+        Args:
+            user_ids (Iterable[int]): The ids of the users.
+
+        Returns:
+            Dict[int, Dict]: The users found, by id.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.get_many, list(user_ids))
+
+
+class SQLiteUserStore(UserStore):
+    """Stores the users in a SQLite database.
+    """
+    BATCH_SIZE = 500  # Ids per query, below SQLite's parameter limit
+
+    def __init__(self, path: str = ":memory:",
+                 users: Optional[Dict[int, Dict]] = None) -> None:
+        """Opens the database, creating the users table if needed.
+
+        Args:
+            path (str): The database file, in memory by default.
+            users (Optional[Dict[int, Dict]]): Users to add or replace.
+        """
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.row_factory = sqlite3.Row
+        with self.__lock, self.__db:
+            self.__db.execute(
+                "CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY,"
+                " name TEXT, locale TEXT, timezone TEXT)")
+        if users:
+            self.add(users)
+
+    def add(self, users: Dict[int, Dict]) -> None:
+        """Adds or replaces users.
+
+        Args:
+            users (Dict[int, Dict]): The users, by id.
+        """
+        rows = [(user_id, user["name"], user["locale"], user["timezone"])
+                for user_id, user in users.items()]
+        with self.__lock, self.__db:
+            self.__db.executemany(
+                "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)", rows)
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Fetches several users, with one query per BATCH_SIZE ids.
+        """
+        user_ids = list(user_ids)
+        rows = []
+        for start in range(0, len(user_ids), self.BATCH_SIZE):
+            batch = user_ids[start:start + self.BATCH_SIZE]
+            query = "SELECT * FROM users WHERE id IN ({})".format(
+                ", ".join("?" * len(batch)))
+            with self.__lock:
+                rows += self.__db.execute(query, batch).fetchall()
+        return {row["id"]: {"name": row["name"], "locale": row["locale"],
+                            "timezone": row["timezone"]} for row in rows}
+
+
+class CachedUserStore(UserStore):
+    """Read-through cache in front of another store, keeping the last
+    used users, and the ids of missing ones, for a limited time.
+    """
+
+    def __init__(self, store: UserStore, max_items: int = 1024,
+                 ttl: float = 60, clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        """Caches the users of store.
+
+        Args:
+            store (UserStore): The store to read through.
+            max_items (int): The number of users kept, least recently
+                used first out.
+            ttl (float): The seconds a user is kept before being fetched
+                again.
+            clock (Callable[[], float]): The time source of the ttl.
+        """
+        self.store = store
+        self.max_items = max_items
+        self.ttl = ttl
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__users = OrderedDict()  # id -> (deadline, user or None)
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Fetches several users, reading the ones not cached from the
+        store with a single batch.
+        """
+        found, missing = self.__cached(user_ids)
+        if missing:
+            fetched = self.store.get_many(missing)
+            self.__keep({user_id: fetched.get(user_id)
+                         for user_id in missing})
+            found.update(fetched)
+        return found
+
+    async def get_many_async(self, user_ids: Iterable[int]
+                             ) -> Dict[int, Dict]:
+        """Fetches several users like get_many, awaiting the store only
+        for the ones not cached.
+        """
+        found, missing = self.__cached(user_ids)
+        if missing:
+            fetched = await self.store.get_many_async(missing)
+            self.__keep({user_id: fetched.get(user_id)
+                         for user_id in missing})
+            found.update(fetched)
+        return found
+
+    def prefetch(self, user_ids: Iterable[int]) -> None:
+        """Loads users into the cache ahead of their requests.
+
+        Args:
+            user_ids (Iterable[int]): The ids of the users.
+        """
+        self.get_many(user_ids)
+
+    async def prefetch_async(self, user_ids: Iterable[int]) -> None:
+        """Loads users into the cache ahead of their requests, without
+        blocking the event loop.
+
+        Args:
+            user_ids (Iterable[int]): The ids of the users.
+        """
+        await self.get_many_async(user_ids)
+
+    def clear(self) -> None:
+        """Forgets every cached user.
+        """
+        with self.__lock:
+            self.__users.clear()
+
+    def __cached(self, user_ids: Iterable[int]
+                 ) -> Tuple[Dict[int, Dict], List[int]]:
+        """Splits user_ids into the users cached and the ids to fetch.
+        """
+        found = {}
+        missing = []
+        now = self.clock()
+        with self.__lock:
+            for user_id in user_ids:
+                entry = self.__users.get(user_id)
+                if entry is None or entry[0] <= now:
+                    missing.append(user_id)
+                    continue
+                self.__users.move_to_end(user_id)
+                if entry[1] is not None:
+                    found[user_id] = entry[1]
+        return found, missing
+
+    def __keep(self, users: Dict[int, Optional[Dict]]) -> None:
+        """Caches users fetched from the store, None for missing ones.
+        """
+        deadline = self.clock() + self.ttl
+        with self.__lock:
+            for user_id, user in users.items():
+                self.__users[user_id] = (deadline, user)
+                self.__users.move_to_end(user_id)
+            while len(self.__users) > self.max_items:
+                self.__users.popitem(last=False)